@@ -0,0 +1,261 @@
+"""
+Benchmark suite of the msfun_* functions on synthetic EEG/MEG-shaped data.
+
+Usage:
+    python benchmarks/msfun_benchmark.py run [--preset quick|full] [--bench NAME ...] [--out FILE]
+    python benchmarks/msfun_benchmark.py compare BASELINE.json CURRENT.json [--threshold 0.2]
+
+'run' times every benchmark over a grid of channel counts, durations, epoch counts and dtypes
+and writes the minimum / median time of a few repeats and the peak traced memory (tracemalloc)
+of one extra run to a JSON file. The FIFF and MFF readers run on small recordings generated in
+a temporary directory (the MFF reader through its decoded-sample cache), nothing is downloaded.
+
+'compare' matches the cases of two result files and flags every case whose minimum time (or
+peak memory) grew by more than the threshold; it exits with status 1 when there is any.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from copy import deepcopy
+from itertools import product
+
+import numpy as np
+import scipy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msfun.filt_preparecosine import msfun_filt_preparecosine
+from msfun.filt_applyfilter import msfun_sig_filter, filt_map
+from msfun.sig_spectrum import msfun_filt_computespectrum
+from msfun.filt_slowmodulation import msfun_filt_slowmodulation
+from msfun.filt_downsample import msfun_filt_downsample
+from msfun.filt_concatenate import msfun_sig_concat_epoch
+from msfun.filt_orthogonalize import msfun_filt_orthogonalize
+from msfun.filt_getanalytic import msfun_filt_getanalytic
+from msfun.filt_removeleakage import msfun_filt_removeleakage
+from msfun.filt_bandanalytic import msfun_filt_bandanalytic
+from msfun.filt_welchspectrum import msfun_filt_welchspectrum
+
+presets = {
+    'quick': {'chans': [64, 306], 'durations': [10], 'epochs': [1, 10], 'dtypes': ['float64', 'float32']},
+    'full': {'chans': [64, 306, 1000, 5000], 'durations': [10, 60, 300], 'epochs': [1, 20, 100],
+             'dtypes': ['float64', 'float32']},
+}
+
+sfreq = 1000.
+
+def synthetic(C, dur, K, dtype, seed=0):
+    """
+    (C, dur * sfreq) or (K, C, dur * sfreq / K) pink-ish noise with a 10 Hz rhythm.
+    """
+    rng = np.random.default_rng(seed)
+    T = int(dur * sfreq)
+    x = np.cumsum(rng.standard_normal((C, T)), axis=1) * 1e-2
+    x += np.sin(2 * np.pi * 10 * np.arange(T) / sfreq + rng.uniform(0, 2 * np.pi, (C, 1)))
+    x = x.astype(dtype)
+    if K > 1:
+        L = T // K
+        x = np.ascontiguousarray(x[:, :K * L].reshape(C, K, L).transpose(1, 0, 2))
+    return x
+
+def _analytic(x):
+    return msfun_filt_getanalytic(np.ascontiguousarray(x))
+
+# name -> (setup(x) -> args, call(*args))
+benchmarks = {
+    'preparecosine': (lambda x, tmp: (x.shape[-1],),
+                      lambda T: msfun_filt_preparecosine(filt_map['alpha'], T, sfreq)),
+    'sig_filter': (lambda x, tmp: (x,),
+                   lambda x: msfun_sig_filter(x, {'sfreq': sfreq, 'filt': 'alpha'})),
+    'computespectrum': (lambda x, tmp: (x,),
+                        lambda x: msfun_filt_computespectrum(x, {'sfreq': sfreq, 'average': True,
+                                                                 'return_band_par': True})),
+    'welchspectrum': (lambda x, tmp: (x,),
+                      lambda x: msfun_filt_welchspectrum(x, {'sfreq': sfreq, 'nfft': min(2048, x.shape[-1])})),
+    'getanalytic': (lambda x, tmp: (x,), msfun_filt_getanalytic),
+    'bandanalytic': (lambda x, tmp: (x,),
+                     lambda x: msfun_filt_bandanalytic(x, {'sfreq': sfreq, 'filt': 'alpha'})),
+    'slowmodulation': (lambda x, tmp: (_analytic(x), int(10 * x.shape[-1] / sfreq) + 1),
+                       msfun_filt_slowmodulation),
+    'downsample': (lambda x, tmp: (x,),
+                   lambda x: msfun_filt_downsample(x, {'sfreq': sfreq, 'downsfreq': 100})),
+    'concatenate': (lambda x, tmp: (x, x.shape[0] if x.ndim == 3 else 1000),
+                    msfun_sig_concat_epoch),
+    'orthogonalize': (lambda x, tmp: _xy(_analytic(_flat(x))), msfun_filt_orthogonalize),
+    'removeleakage': (lambda x, tmp: _xy(_flat(x)),
+                      lambda X, Y: msfun_filt_removeleakage(X, Y, {'method': 'orthstat'})),
+    'preprocfiff': (lambda x, tmp: _fiff_case(x, tmp), lambda *a: _preprocfiff(*a)),
+    'preprocmff': (lambda x, tmp: _mff_case(x, tmp), lambda *a: _preprocmff(*a)),
+}
+
+def _flat(x):
+    return x if x.ndim == 2 else np.concatenate(list(x), axis=1)
+
+def _xy(x):
+    return x[1:], x[:1]
+
+def _epoch_times(x):
+    # (K, L) sample times of back-to-back epochs, or (1, T) for continuous data
+    T = x.shape[-1] * (x.shape[0] if x.ndim == 3 else 1)
+    t = np.arange(T) / sfreq
+    return t.reshape(x.shape[0], -1) if x.ndim == 3 else t[np.newaxis, :]
+
+def _fiff_case(x, tmp):
+    import mne
+    data = _flat(x).astype(np.float64) * 1e-6
+    names = [f'EEG{i:04d}' for i in range(data.shape[0])]
+    path = os.path.join(tmp, f'bench_{data.shape[0]}_{data.shape[1]}_raw.fif')
+    if not os.path.exists(path):
+        raw = mne.io.RawArray(data, mne.create_info(names, sfreq, 'eeg'), verbose='ERROR')
+        raw.save(path, overwrite=True, verbose='ERROR')
+    return path, _epoch_times(x), names
+
+def _preprocfiff(path, times, names):
+    import mne
+    from msfun.filt_preprocfiff import msfun_filt_preprocfiff
+    raw = mne.io.read_raw_fif(path, preload=False, verbose='ERROR')
+    cfg = {'chans': names, 'filter': True, 'filt': deepcopy(filt_map['alpha']), 'blc': True}
+    return msfun_filt_preprocfiff(raw, times, cfg)
+
+def _mff_case(x, tmp):
+    # A stand-in .mff bundle whose decoded-sample cache is already populated
+    from msfun.filt_preprocmff import mff_cache_files, _mff_signature
+    data = _flat(x).astype(np.float64)
+    names = [f'E{i + 1}' for i in range(data.shape[0])]
+    mff = os.path.join(tmp, f'bench_{data.shape[0]}_{data.shape[1]}.mff')
+    cache_dir = os.path.join(tmp, 'mff_cache')
+    npy_file, meta_file = mff_cache_files(mff, cache_dir)
+    if not os.path.exists(meta_file):
+        os.makedirs(mff, exist_ok=True)
+        with open(os.path.join(mff, 'info.xml'), 'w') as fid:
+            fid.write('<fileInfo/>')
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(npy_file, data)
+        with open(meta_file, 'w') as fid:
+            json.dump({'mff_file': os.path.abspath(mff), 'signature': _mff_signature(os.path.abspath(mff)),
+                       'ch_names': names, 'sfreq': sfreq}, fid)
+    return mff, cache_dir, _epoch_times(x), names
+
+def _preprocmff(mff, cache_dir, times, names):
+    from msfun.filt_preprocmff import msfun_filt_preprocmff
+    cfg = {'mff_file': mff, 'cache_dir': cache_dir, 'chans': names, 'filter': True,
+           'filt': deepcopy(filt_map['alpha']), 'blc': True}
+    return msfun_filt_preprocmff(times, sfreq, cfg)
+
+def run_case(call, args, repeat):
+    """
+    Minimum and median wall time over repeat calls, and peak traced memory of one more call.
+    """
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            call(*args)
+            times.append(time.perf_counter() - t0)
+        tracemalloc.start()
+        try:
+            base = tracemalloc.get_traced_memory()[0]
+            call(*args)
+            peak = tracemalloc.get_traced_memory()[1] - base
+        finally:
+            tracemalloc.stop()
+    return {'time_min': min(times), 'time_median': float(np.median(times)), 'repeat': repeat,
+            'peak_bytes': max(int(peak), 0)}
+
+def run(args):
+    grid = dict(presets[args.preset])
+    for key in ['chans', 'durations', 'epochs', 'dtypes']:
+        if getattr(args, key):
+            grid[key] = getattr(args, key)
+    names = [n for n in benchmarks if not args.bench or any(b in n for b in args.bench)]
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for C, dur, K, dtype in product(grid['chans'], grid['durations'], grid['epochs'], grid['dtypes']):
+            nbytes = C * dur * sfreq * np.dtype(dtype).itemsize
+            if nbytes > args.max_bytes:
+                print(f"msfun_benchmark - Skipping {C} chans x {dur} s ({nbytes / 2 ** 30:.1f} GB > --max-bytes)")
+                continue
+            x = synthetic(C, dur, K, dtype)
+            for name in names:
+                setup, call = benchmarks[name]
+                params = {'chans': C, 'duration': dur, 'epochs': K, 'dtype': dtype}
+                try:
+                    res = run_case(call, setup(x, tmp), args.repeat)
+                except ImportError as err:
+                    print(f"msfun_benchmark - Skipping {name}: {err}")
+                    continue
+                results.append(dict(bench=name, params=params, **res))
+                print(f"msfun_benchmark - {name:16s} C={C:5d} dur={dur:4d}s K={K:4d} {dtype:8s} "
+                      f"{res['time_min'] * 1e3:10.2f} ms {res['peak_bytes'] / 2 ** 20:10.1f} MB")
+
+    meta = {'date': datetime.datetime.now().isoformat(timespec='seconds'), 'preset': args.preset,
+            'python': platform.python_version(), 'numpy': np.__version__, 'scipy': scipy.__version__,
+            'machine': platform.machine(), 'processor': platform.processor(), 'cpus': os.cpu_count()}
+    with open(args.out, 'w') as fid:
+        json.dump({'meta': meta, 'results': results}, fid, indent=1)
+    print(f"msfun_benchmark - {len(results)} results written to {args.out}")
+    return 0
+
+def _case_key(res):
+    return (res['bench'],) + tuple(sorted(res['params'].items()))
+
+def compare(args):
+    with open(args.baseline) as fid:
+        base = {_case_key(r): r for r in json.load(fid)['results']}
+    with open(args.current) as fid:
+        cur = {_case_key(r): r for r in json.load(fid)['results']}
+
+    flagged = 0
+    for key in sorted(set(base) & set(cur)):
+        b, c = base[key], cur[key]
+        t_ratio = c['time_min'] / b['time_min'] if b['time_min'] > 0 else np.inf
+        m_ratio = c['peak_bytes'] / b['peak_bytes'] if b['peak_bytes'] > 0 else 1.0
+        slow = t_ratio > 1 + args.threshold
+        fat = m_ratio > 1 + args.threshold
+        flagged += slow or fat
+        mark = ' '.join(m for m, on in [('SLOWER', slow), ('MORE-MEMORY', fat)] if on)
+        params = ' '.join(f'{k}={v}' for k, v in key[1:])
+        print(f"{key[0]:16s} {params:50s} time x{t_ratio:5.2f}  mem x{m_ratio:5.2f}  {mark}")
+
+    missing = set(base) - set(cur)
+    if missing:
+        print(f"msfun_benchmark - {len(missing)} baseline cases missing from {args.current}")
+    print(f"msfun_benchmark - {flagged} regressions over {args.threshold:.0%}")
+    return 1 if flagged else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="msfun_* benchmark suite")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('run', help="run the benchmarks and write a JSON result file")
+    p.add_argument('--preset', choices=sorted(presets), default='quick')
+    p.add_argument('--bench', nargs='*', help="only benchmarks whose name contains one of these")
+    p.add_argument('--chans', nargs='*', type=int)
+    p.add_argument('--durations', nargs='*', type=int)
+    p.add_argument('--epochs', nargs='*', type=int)
+    p.add_argument('--dtypes', nargs='*')
+    p.add_argument('--repeat', type=int, default=3)
+    p.add_argument('--max-bytes', type=float, default=2 ** 30, help="skip inputs larger than this")
+    p.add_argument('--out', default='msfun_benchmark.json')
+
+    p = sub.add_parser('compare', help="flag slowdowns of CURRENT against BASELINE")
+    p.add_argument('baseline')
+    p.add_argument('current')
+    p.add_argument('--threshold', type=float, default=0.2, help="relative slowdown flagged [default 0.2]")
+
+    args = parser.parse_args(argv)
+    return run(args) if args.command == 'run' else compare(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
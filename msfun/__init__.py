@@ -0,0 +1,54 @@
+"""
+Signal processing toolbox for electrophysiological data.
+
+The public functions and classes of the msfun_* modules are available from the package,
+e.g. `from msfun import msfun_sig_filter`. Submodules are only imported on first access,
+so `import msfun` stays cheap and heavy dependencies (mne, scipy.signal, scipy.linalg) are
+loaded by the functions that need them.
+"""
+import importlib
+
+__version__ = '0.1.0'
+
+_exports = {
+    'filt_applyfilter': ['filt_map', 'resolve_filt', 'msfun_sig_filter', 'msfun_sig_filterbank',
+                         'filter_fft', 'filter_decimate'],
+    'filt_bandanalytic': ['msfun_filt_bandanalytic'],
+    'filt_batch': ['msfun_filt_batch', 'batch_output'],
+    'filt_concatenate': ['msfun_sig_concat_epoch'],
+    'filt_downsample': ['msfun_filt_downsample'],
+    'filt_fftbackend': ['msfun_filt_fftbackend', 'fft_workers', 'fft_overwrite'],
+    'filt_getanalytic': ['msfun_filt_getanalytic', 'analytic_weights'],
+    'filt_instrument': ['msfun_filt_instrument', 'span', 'Collector'],
+    'filt_online': ['OnlineProcessor', 'synthetic_stream'],
+    'filt_orthconnectivity': ['msfun_filt_orthconnectivity'],
+    'filt_orthogonalize': ['msfun_filt_orthogonalize'],
+    'filt_pipeline': ['Pipeline'],
+    'filt_precision': ['msfun_filt_precision', 'float_dtype', 'as_float'],
+    'filt_preparecosine': ['msfun_filt_preparecosine', 'cos_filt', 'CosineFilterCache', 'cosine_cache'],
+    'filt_preprocfiff': ['msfun_filt_preprocfiff', 'gather_samples', 'read_spans', 'preproc_filter',
+                         'baseline_correct'],
+    'filt_preprocmff': ['msfun_filt_preprocmff', 'mff_cache', 'mff_cache_files'],
+    'filt_removeleakage': ['msfun_filt_removeleakage', 'orthstat_beta', 'OrthStatRegressor', 'GCSOperator'],
+    'filt_slowmodulation': ['msfun_filt_slowmodulation'],
+    'filt_spectralfeatures': ['msfun_filt_spectralfeatures'],
+    'filt_streamfilter': ['msfun_filt_streamfilter', 'fir_ntaps', 'cosine_fir'],
+    'filt_welchspectrum': ['msfun_filt_welchspectrum', 'welch_tapers'],
+    'sig_spectrum': ['msfun_filt_computespectrum', 'spectrum_band_par'],
+}
+
+_module_of = {name: module for module, names in _exports.items() for name in names}
+
+__all__ = sorted(_module_of)
+
+def __getattr__(name):
+    if name in _module_of:
+        value = getattr(importlib.import_module('.' + _module_of[name], __name__), name)
+        globals()[name] = value
+        return value
+    if name in _exports:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_module_of) | set(_exports))
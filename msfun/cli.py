@@ -0,0 +1,119 @@
+"""
+Command-line entry point: msfun filter|spectrum|preproc CONFIG INPUT... [-o OUT_DIR]
+
+CONFIG is a JSON file holding the cfg dict of the underlying function:
+- filter: msfun_sig_filter cfg ('sfreq', 'filt', optional 'downsfreq', 'fft_workers', ...);
+  each .npy / .npz input array is written to OUT_DIR/<name>_filter.npz ('sig', and 'tsamp'
+  when downsampled)
+- spectrum: msfun_filt_computespectrum cfg, or msfun_filt_welchspectrum cfg with
+  "method": "welch"; written to OUT_DIR/<name>_spectrum.npz ('spec', 'freq', band_par keys)
+- preproc: msfun_filt_batch cfg ('preproc', 'times' as a list or a .npy path, ...) run over
+  .fif / .mff inputs; OUT_DIR replaces cfg['out_dir']
+
+Only the standard library is imported at startup; numpy, scipy and the msfun modules are
+loaded by the command that needs them.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='msfun', description="msfun signal processing toolbox")
+    parser.add_argument('--version', action='store_true', help="print the version and exit")
+    parser.add_argument('-v', '--verbose', action='store_true', help="show progress messages")
+    sub = parser.add_subparsers(dest='command')
+    for name, text in [('filter', "cosine band-pass filter of .npy/.npz arrays"),
+                       ('spectrum', "power spectrum of .npy/.npz arrays"),
+                       ('preproc', "read, filter and save FIFF/MFF recordings")]:
+        p = sub.add_parser(name, help=text)
+        p.add_argument('config', help="JSON config file")
+        p.add_argument('inputs', nargs='+', help="input files")
+        p.add_argument('-o', '--out-dir', default='.', help="output directory [default .]")
+
+    args = parser.parse_args(argv)
+    if args.version:
+        from . import __version__
+        print(__version__)
+        return 0
+    if args.command is None:
+        parser.print_help()
+        return 2
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(message)s')
+    with open(args.config) as fid:
+        cfg = json.load(fid)
+    if not isinstance(cfg, dict):
+        parser.error("the config file must hold a JSON object")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    return {'filter': _filter, 'spectrum': _spectrum, 'preproc': _preproc}[args.command](cfg, args)
+
+def _load(path):
+    import numpy as np
+    if path.endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+    with np.load(path) as data:
+        if 'sig' in data:
+            return data['sig']
+        if len(data.files) != 1:
+            raise ValueError(f"{path}: expected a 'sig' array or a single array")
+        return data[data.files[0]]
+
+def _output(path, out_dir, suffix):
+    name = os.path.basename(path)
+    for ext in ['.npy', '.npz']:
+        if name.endswith(ext):
+            name = name[:-len(ext)]
+    return os.path.join(out_dir, f"{name}_{suffix}.npz")
+
+def _filter(cfg, args):
+    import copy
+    import numpy as np
+    from .filt_applyfilter import msfun_sig_filter
+
+    for path in args.inputs:
+        fcfg = copy.deepcopy(cfg)
+        result = {'sig': msfun_sig_filter(_load(path), fcfg)}
+        if 'tsamp' in fcfg:
+            result['tsamp'] = fcfg['tsamp']
+        np.savez(_output(path, args.out_dir, 'filter'), **result)
+    return 0
+
+def _spectrum(cfg, args):
+    import copy
+    import numpy as np
+
+    cfg = dict(cfg)
+    if cfg.pop('method', 'fft') == 'welch':
+        from .filt_welchspectrum import msfun_filt_welchspectrum as spectrum
+    else:
+        from .sig_spectrum import msfun_filt_computespectrum as spectrum
+
+    for path in args.inputs:
+        out = spectrum(_load(path), copy.deepcopy(cfg))
+        result = {'spec': out[0], 'freq': out[1]}
+        if len(out) > 2:
+            result.update(out[2])
+        np.savez(_output(path, args.out_dir, 'spectrum'), **result)
+    return 0
+
+def _preproc(cfg, args):
+    import numpy as np
+    from .filt_batch import msfun_filt_batch
+
+    cfg = dict(cfg, out_dir=args.out_dir)
+    if isinstance(cfg.get('times'), str):
+        cfg['times'] = np.load(cfg['times'])
+    elif isinstance(cfg.get('times'), list):
+        cfg['times'] = np.asarray(cfg['times'])
+    status = msfun_filt_batch(args.inputs, cfg)
+    for s in status:
+        if s['status'] == 'failed':
+            print(f"msfun preproc - {s['file']}: {s['error']}", file=sys.stderr)
+    return 1 if any(s['status'] == 'failed' for s in status) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+import numpy as np
+from scipy.fft import fft, ifft, rfft, irfft
+from warnings import warn
+from .filt_preparecosine import msfun_filt_preparecosine
+from .filt_fftbackend import fft_workers, fft_overwrite
+from .filt_precision import float_dtype, cast_dtype
+from .filt_instrument import logger, span
+
+filt_map = {
+    'none': None,
+    'delta':   {'win': 'boxcar', 'par': ['high', 'low'], 'freq': [1, 4], 'width': [0.5, 0.5]},
+    'theta':   {'win': 'boxcar', 'par': ['high', 'low'], 'freq': [4, 8], 'width': [1, 1]},
+    'alpha':   {'win': 'boxcar', 'par': ['high', 'low'], 'freq': [8, 12], 'width': [1, 1]},
+    'beta':    {'win': 'boxcar', 'par': ['high', 'low'], 'freq': [12, 30], 'width': [2, 2]},
+    'betalow': {'win': 'boxcar', 'par': ['high', 'low'], 'freq': [12, 21], 'width': [1, 1]},
+    'betahigh':{'win': 'boxcar', 'par': ['high', 'low'], 'freq': [21, 30], 'width': [1, 1]},
+    'gamma':   {'win': 'boxcar', 'par': ['high', 'low'], 'freq': [30, 45], 'width': [2, 2]},
+    'gammalow':{'win': 'boxcar', 'par': ['high', 'low'], 'freq': [30, 37.5], 'width': [1, 1]},
+    'gammahigh':{'win': 'boxcar', 'par': ['high', 'low'], 'freq': [37.5, 45], 'width': [1, 1]}
+}
+
+def resolve_filt(filt):
+    """
+    Resolve a filter name (key of filt_map) or filter dict into a validated filter dict (or None).
+    """
+    if isinstance(filt, str):
+        band = filt.lower()
+        if band not in filt_map:
+            raise ValueError(f"Unknown filter name: {band}")
+        filt = filt_map[band]
+
+    if filt is not None:
+        if not all(k in filt for k in ['win', 'par', 'freq', 'width']):
+            raise ValueError("cfg.filt must contain 'win', 'par', 'freq', 'width'")
+        if not (len(filt['par']) == len(filt['freq']) == len(filt['width'])):
+            raise ValueError("Mismatch in lengths of 'par', 'freq', and 'width'")
+
+    return filt
+
+def _check_inputs(sig, cfg):
+    if sig is None or cfg is None:
+        raise ValueError("sig_filter requires both signal and config")
+
+    if not isinstance(sig, np.ndarray):
+        raise TypeError("Signal must be a numeric array")
+
+    if sig.ndim not in [2, 3]:
+        raise ValueError("Signal must be 2D or 3D")
+
+    if not isinstance(cfg, dict) or 'sfreq' not in cfg or 'filt' not in cfg:
+        raise ValueError("cfg must contain 'sfreq' and 'filt' fields")
+
+def msfun_sig_filter(sig, cfg):
+    """
+    Applies a spectral cosine filter to a 2D or 3D signal array.
+
+    With cfg['downsfreq'] set, the filtered spectrum is also cropped to the target Nyquist
+    frequency and inverse-transformed at the reduced length, giving anti-aliased downsampled
+    output in one pass; cfg['tsamp'] then holds the original sample index of each output
+    sample and cfg['downsfreq'] the effective output rate.
+
+    With cfg['dtype'] (or msfun_filt_precision) set to 'float32', the filter runs and returns
+    in float32.
+    """
+    _check_inputs(sig, cfg)
+    downsfreq = cfg.get('downsfreq')
+    dtype = float_dtype(cfg)
+
+    if isinstance(cfg['filt'], str):
+        filt = resolve_filt(cfg['filt'])
+        if filt is None and downsfreq is None:
+            warn("sig_filter - No filter applied... Just copying data.")
+            return np.array(sig, dtype=cast_dtype(sig, dtype))
+        else:
+            cfg['filt'] = filt
+
+    filt = resolve_filt(cfg['filt'])
+
+    if filt is None and downsfreq is None:
+        logger.info("sig_filter - Copying data...")
+        return np.array(sig, dtype=cast_dtype(sig, dtype))
+
+    T = sig.shape[-1]
+    if downsfreq is not None:
+        if not isinstance(downsfreq, (int, float)) or downsfreq <= 0 or downsfreq > cfg['sfreq']:
+            raise ValueError("cfg.downsfreq must be positive and at most cfg.sfreq")
+
+    with span('sig_filter'):
+        if downsfreq is not None:
+            logger.info("sig_filter - Filtering and downsampling data...")
+            if filt is None:
+                win, F = np.ones(T, dtype=dtype), np.ones(T // 2 + 1, dtype=dtype)
+            else:
+                win, F = msfun_filt_preparecosine(filt, T, cfg['sfreq'], onesided=True, cache=True, dtype=dtype)
+            M = max(1, int(round(T * downsfreq / cfg['sfreq'])))
+
+            # Real part first: the mask is Hermitian, so this matches filtering the full complex signal
+            with span('window') as sp:
+                x = np.multiply(np.real(sig), win, dtype=dtype)
+                sp.alloc(x)
+            sig_filt = filter_decimate(x, F, M, fft_workers(cfg), fft_overwrite(cfg))
+            cfg['tsamp'] = np.round(np.arange(M) * T / M).astype(int)
+            cfg['downsfreq'] = cfg['sfreq'] * M / T
+            logger.info("sig_filter - Filtered data ready.")
+            return sig_filt
+
+        logger.info("sig_filter - Filtering data...")
+        real = np.isrealobj(sig)
+        win, F = msfun_filt_preparecosine(filt, T, cfg['sfreq'], onesided=real, cache=True, dtype=dtype)
+
+        # All epochs and channels in one transform, so multithreaded FFTs can use every core
+        with span('window') as sp:
+            x = np.multiply(sig, win, dtype=cast_dtype(sig, dtype))
+            sp.alloc(x)
+        sig_filt = filter_fft(x, F, real, fft_workers(cfg), fft_overwrite(cfg))
+
+    logger.info("sig_filter - Filtered data ready.")
+    return sig_filt
+
+def filter_fft(x, F, real, workers=None, overwrite_x=False):
+    """
+    Multiply the spectrum of the (already windowed, caller-owned) array x by the mask F along the last axis.
+
+    Real input uses rfft/irfft with the one-sided mask; F being Hermitian, this matches real(ifft(fft * F)).
+    """
+    T = x.shape[-1]
+    with span('fft') as sp:
+        if real:
+            Fx = rfft(x, axis=-1, workers=workers, overwrite_x=overwrite_x)
+        else:
+            Fx = fft(x, axis=-1, workers=workers, overwrite_x=overwrite_x)
+        sp.alloc(Fx)
+    with span('mask'):
+        Fx *= F
+    with span('ifft') as sp:
+        if real:
+            y = irfft(Fx, n=T, axis=-1, workers=workers, overwrite_x=overwrite_x)
+        else:
+            y = np.real(ifft(Fx, axis=-1, workers=workers, overwrite_x=overwrite_x))
+        sp.alloc(y)
+    return y
+
+def filter_decimate(x, F, M, workers=None, overwrite_x=False):
+    """
+    Filter the real (windowed, caller-owned) array x with the one-sided mask F and resample it
+    to M samples by keeping only the M//2 + 1 lowest frequencies of its spectrum.
+    """
+    T = x.shape[-1]
+    with span('fft') as sp:
+        Fx = rfft(x, axis=-1, workers=workers, overwrite_x=overwrite_x)
+        sp.alloc(Fx)
+    with span('mask') as sp:
+        h = min(M // 2 + 1, Fx.shape[-1])
+        Fx = Fx[..., :h] * F[:h] * (M / T)
+        if M % 2 == 0 and h == M // 2 + 1 and M < T:
+            Fx[..., -1] *= 2  # the cropped Nyquist bin collects both +/- M/2 components of the original spectrum
+        sp.alloc(Fx)
+    with span('ifft') as sp:
+        y = irfft(Fx, n=M, axis=-1, workers=workers, overwrite_x=True)
+        sp.alloc(y)
+    return y
+
+def msfun_sig_filterbank(sig, cfg):
+    """
+    Applies several spectral cosine filters to a 2D or 3D signal array with one forward FFT.
+
+    Parameters:
+    - sig: array (C, T) or (K, C, T)
+    - cfg: dict with keys:
+        - sfreq: sampling rate (Hz)
+        - filt: list of band names (keys of filt_map) and/or filter dicts
+        - stack: True to return all bands stacked [default], False to return a
+          generator yielding one filtered band at a time (bounded peak memory)
+        - dtype: (optional) 'float32' or 'float64' working precision, see msfun_filt_precision
+
+    Returns:
+    - sig_bank: array (B, C, T) or (B, K, C, T), or a generator of (C, T) / (K, C, T) arrays;
+      filtered bands are real, a 'none' band is a copy of sig (so the stacked bank is complex
+      for complex sig)
+    """
+    _check_inputs(sig, cfg)
+
+    if isinstance(cfg['filt'], (str, dict)) or cfg['filt'] is None:
+        cfg['filt'] = [cfg['filt']]
+
+    cfg['filt'] = [resolve_filt(f) for f in cfg['filt']]
+    if not cfg['filt']:
+        raise ValueError("cfg.filt must contain at least one filter")
+
+    dtype = float_dtype(cfg)
+    bands = _iter_filterbank(sig, cfg['filt'], cfg['sfreq'], fft_workers(cfg), fft_overwrite(cfg), dtype)
+    if not cfg.get('stack', True):
+        return bands
+
+    bank_dtype = dtype or np.float64
+    if any(f is None for f in cfg['filt']):
+        # A 'none' band is a copy of sig: keep the imaginary part of complex input
+        bank_dtype = np.result_type(bank_dtype, cast_dtype(sig, dtype) or sig.dtype)
+    sig_bank = np.empty((len(cfg['filt']),) + sig.shape, dtype=bank_dtype)
+    for b, sig_filt in enumerate(bands):
+        sig_bank[b] = sig_filt
+    return sig_bank
+
+def _iter_filterbank(sig, filts, sfreq, workers, overwrite_x, dtype=None):
+    T = sig.shape[-1]
+    real = np.isrealobj(sig)
+    Fsig = {}  # forward spectra, one per distinct window
+
+    logger.info("sig_filterbank - Filtering data...")
+    for filt in filts:
+        if filt is None:
+            yield np.array(sig, dtype=cast_dtype(sig, dtype))
+            continue
+
+        win, F = msfun_filt_preparecosine(filt, T, sfreq, onesided=real, cache=True, dtype=dtype)
+        key = str(filt['win'])
+        if key not in Fsig:
+            x = np.multiply(sig, win, dtype=cast_dtype(sig, dtype))
+            if real:
+                Fsig[key] = rfft(x, axis=-1, workers=workers, overwrite_x=overwrite_x)
+            else:
+                Fsig[key] = fft(x, axis=-1, workers=workers, overwrite_x=overwrite_x)
+        # The shared spectrum is kept; only the masked copy is handed over to the inverse FFT
+        if real:
+            yield irfft(Fsig[key] * F, n=T, axis=-1, workers=workers, overwrite_x=overwrite_x)
+        else:
+            yield np.real(ifft(Fsig[key] * F, axis=-1, workers=workers, overwrite_x=overwrite_x))
+
+    logger.info("sig_filterbank - Filtered data ready.")
@@ -0,0 +1,149 @@
+import os
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import deepcopy
+from .filt_applyfilter import msfun_sig_filter
+from .filt_preprocfiff import msfun_filt_preprocfiff
+from .filt_preprocmff import msfun_filt_preprocmff
+from .sig_spectrum import msfun_filt_computespectrum
+from .filt_instrument import logger
+
+thread_vars = ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+               'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS']
+
+def msfun_filt_batch(files, cfg):
+    """
+    Run the preproc -> filter -> spectrum chain over many FIFF/MFF recordings in a process pool.
+
+    Each recording is written to cfg['out_dir']/<name>.npz (keys 'sig', and 'spec'/'freq'
+    when a spectrum is requested) as soon as it finishes. Recordings whose output already
+    exists are skipped, so an interrupted run resumes where it stopped.
+
+    Parameters:
+    - files: list of .fif / .mff paths
+    - cfg: dict with keys:
+        - out_dir: output directory
+        - preproc: cfg for msfun_filt_preprocfiff / msfun_filt_preprocmff ('chans', 'filter', 'blc', ...)
+        - times: sample times shared by all files, or dict {file: times}
+        - sfreq: (MFF only) nominal sampling rate passed to msfun_filt_preprocmff
+        - filt: (optional) filter for msfun_sig_filter after preprocessing
+        - spectrum: (optional) cfg for msfun_filt_computespectrum ('sfreq' is filled in)
+        - workers: number of worker processes [default os.cpu_count()]
+        - threads: BLAS/OpenMP threads per worker [default 1]
+
+    Returns:
+    - status: list of dicts with 'file', 'out', 'status' ('done', 'skipped' or 'failed') and 'error'
+    """
+    if files is None or cfg is None:
+        raise ValueError("sig_batch requires a list of files and a config")
+
+    if isinstance(files, str):
+        files = [files]
+
+    if not isinstance(cfg, dict) or 'out_dir' not in cfg or 'preproc' not in cfg or 'times' not in cfg:
+        raise ValueError("cfg must contain 'out_dir', 'preproc' and 'times'")
+
+    for f in files:
+        if not f.rstrip(os.sep).endswith(('.fif', '.fif.gz', '.mff')):
+            raise ValueError(f"Unsupported file type: {f}")
+        if f.rstrip(os.sep).endswith('.mff') and 'sfreq' not in cfg:
+            raise ValueError("cfg must contain 'sfreq' for MFF files")
+
+    outs = [batch_output(f, cfg['out_dir']) for f in files]
+    if len(set(outs)) != len(outs):
+        raise ValueError("Several files map to the same output name")
+
+    workers = cfg.get('workers') or os.cpu_count()
+    threads = cfg.get('threads', 1)
+    if not isinstance(workers, int) or workers <= 0 or not isinstance(threads, int) or threads <= 0:
+        raise ValueError("cfg.workers and cfg.threads must be positive integers")
+
+    os.makedirs(cfg['out_dir'], exist_ok=True)
+
+    status = []
+    todo = []
+    for f, out in zip(files, outs):
+        if os.path.exists(out):
+            status.append({'file': f, 'out': out, 'status': 'skipped', 'error': None})
+        else:
+            todo.append((f, out))
+    logger.info(f"sig_batch - {len(todo)} files to process, {len(status)} already done...")
+    if not todo:
+        return status
+
+    # Cap BLAS/OpenMP threads: spawned workers inherit the environment before importing numpy
+    saved = {v: os.environ.get(v) for v in thread_vars}
+    os.environ.update({v: str(threads) for v in thread_vars})
+    try:
+        ctx = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo)), mp_context=ctx,
+                                 initializer=_init_worker, initargs=(threads,)) as pool:
+            jobs = {pool.submit(_run_file, f, out, _file_cfg(cfg, f)): (f, out) for f, out in todo}
+            for job in as_completed(jobs):
+                f, out = jobs[job]
+                try:
+                    job.result()
+                    status.append({'file': f, 'out': out, 'status': 'done', 'error': None})
+                    logger.info(f"sig_batch - Done: {f}")
+                except Exception as err:
+                    status.append({'file': f, 'out': out, 'status': 'failed', 'error': repr(err)})
+                    logger.warning(f"sig_batch - Failed on {f}: {err!r}")
+    finally:
+        for v, val in saved.items():
+            if val is None:
+                os.environ.pop(v, None)
+            else:
+                os.environ[v] = val
+
+    return status
+
+def batch_output(file, out_dir):
+    """
+    Output path of a recording in msfun_filt_batch.
+    """
+    name = os.path.basename(file.rstrip(os.sep))
+    for ext in ['.fif.gz', '.fif', '.mff']:
+        if name.endswith(ext):
+            name = name[:-len(ext)]
+            break
+    return os.path.join(out_dir, name + '.npz')
+
+def _file_cfg(cfg, file):
+    fcfg = {k: v for k, v in cfg.items() if k != 'times'}
+    times = cfg['times']
+    fcfg['times'] = times[file] if isinstance(times, dict) else times
+    return deepcopy(fcfg)
+
+def _init_worker(threads):
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(threads)
+    except ImportError:
+        pass
+
+def _run_file(file, out, cfg):
+    times = np.asarray(cfg['times'])
+    pcfg = deepcopy(cfg['preproc'])
+    if file.rstrip(os.sep).endswith('.mff'):
+        pcfg['mff_file'] = file
+        sig, pcfg = msfun_filt_preprocmff(times, cfg['sfreq'], pcfg)
+        sfreq = pcfg['sfreq']
+    else:
+        import mne
+        raw = mne.io.read_raw_fif(file, preload=False, verbose='ERROR')
+        sig, pcfg = msfun_filt_preprocfiff(raw, times, pcfg)
+        sfreq = raw.info['sfreq']
+
+    result = {'sig': sig}
+    if cfg.get('filt') is not None and sig.size:
+        result['sig'] = msfun_sig_filter(sig, {'sfreq': sfreq, 'filt': deepcopy(cfg['filt'])})
+    if cfg.get('spectrum') is not None and sig.size:
+        result['spec'], result['freq'] = msfun_filt_computespectrum(
+            result['sig'], dict(cfg['spectrum'], sfreq=sfreq))[:2]
+
+    # Write atomically so an interrupted run never leaves a partial output behind
+    tmp = out[:-len('.npz')] + '.tmp.npz'
+    np.savez(tmp, **result)
+    os.replace(tmp, out)
+    return out
@@ -0,0 +1,77 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+def msfun_sig_concat_epoch(sig, L, type=None, step=None, overlap=None):
+    """
+    Concatenate or epoch a signal array.
+
+    Parameters:
+    - sig: np.ndarray of shape (K, N, T) or (N, T)
+    - L: number of epochs or epoch length depending on mode
+    - type: 'epochnum', 'epochlength' or 'sliding'
+    - step: ('sliding') samples between epoch starts [default L]
+    - overlap: ('sliding') samples shared by consecutive epochs, alternative to step
+
+    Returns:
+    - sigbis: epoched or concatenated signal; in 'sliding' mode, a read-only (epoch, N, L)
+      view of sig (no copy) with epochs starting every step samples
+    """
+    if type is None and sig.ndim == 2:
+        type = 'epochlength'
+    elif type is None and sig.ndim == 3:
+        type = 'epochnum'
+    elif type is None or type.lower() not in ['epochnum', 'epochlength', 'sliding']:
+        raise ValueError("Type must be 'epochnum', 'epochlength' or 'sliding'")
+
+    if not isinstance(sig, np.ndarray) or sig.ndim not in [2, 3]:
+        raise ValueError("sig must be a 2D or 3D numpy array")
+
+    if not isinstance(L, int) or L <= 0:
+        raise ValueError("L must be a positive integer")
+
+    # Sliding-window epoching: strided view of the original buffer
+    if type.lower() == 'sliding':
+        if sig.ndim != 2:
+            raise ValueError("Sliding epochs require a 2D (chan x time) signal")
+        if L > sig.shape[1]:
+            raise ValueError("L longer than the signal")
+        if step is not None and overlap is not None:
+            raise ValueError("Specify either step or overlap, not both")
+        if overlap is not None:
+            if not isinstance(overlap, int) or overlap < 0 or overlap >= L:
+                raise ValueError("overlap must be an integer in [0, L)")
+            step = L - overlap
+        elif step is None:
+            step = L
+        if not isinstance(step, int) or step <= 0:
+            raise ValueError("step must be a positive integer")
+
+        windows = sliding_window_view(sig, L, axis=-1)[:, ::step, :]  # (N, epoch, L), read-only
+        return windows.transpose(1, 0, 2)
+
+    # Epoching mode
+    if sig.ndim == 2:
+        N, T = sig.shape
+        L = min(L, T)
+
+        if type == 'epochlength':
+            epochlength = L
+            epochnum = T // L
+        elif type == 'epochnum':
+            epochnum = L
+            epochlength = T // L
+
+        total_len = min(epochnum * epochlength, T)
+        sig_trimmed = sig[:, :total_len]
+        sigbis = sig_trimmed.reshape(N, epochlength, epochnum)
+        sigbis = np.transpose(sigbis, (2, 0, 1))  # (epochnum, N, epochlength)
+
+    # Concatenation mode
+    else:
+        K, N, T = sig.shape
+        L = min(L, K)
+        sig_trimmed = sig[:L, :, :]
+        sigbis = np.transpose(sig_trimmed, (1, 2, 0))  # (N, T, L)
+        sigbis = sigbis.reshape(N, L * T)
+
+    return sigbis
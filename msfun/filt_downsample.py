@@ -0,0 +1,82 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from .filt_precision import float_dtype, cast_dtype, as_float
+from .filt_instrument import logger, span
+
+def msfun_filt_downsample(sig, cfg):
+    """
+    Downsamples signal along time axis.
+
+    Parameters:
+    - sig: array (C, T) or (K, C, T)
+    - cfg: dict with keys:
+        - sfreq: original sampling rate (Hz)
+        - downsfreq: new sampling rate (Hz)
+        - smooth: True to average samples, False to pick samples
+        - overlap: (if smooth) number of overlapping buffers
+        - chunk: (if smooth) number of input samples averaged per chunk [default 2**20]
+        - dtype: (optional) 'float32' or 'float64' output precision, see msfun_filt_precision
+
+    Returns:
+    - sigbis: downsampled signal
+    - tsamp: time sample indices in original signal
+    """
+
+    if sig is None or cfg is None:
+        raise ValueError("sig_downsample requires signal and cfg")
+
+    if not isinstance(sig, np.ndarray) or sig.ndim not in [2, 3]:
+        raise ValueError("sig must be 2D or 3D numpy array")
+
+    T = sig.shape[-1]
+
+    if not isinstance(cfg, dict) or 'sfreq' not in cfg or 'downsfreq' not in cfg:
+        raise ValueError("cfg must be a dict with 'sfreq' and 'downsfreq'")
+
+    sfreq = cfg['sfreq']
+    downsfreq = cfg['downsfreq']
+    smooth = cfg.get('smooth', True)
+    overlap = cfg.get('overlap', 1)
+
+    if not isinstance(sfreq, (int, float)) or sfreq <= 0:
+        raise ValueError("cfg.sfreq must be positive")
+    if not isinstance(downsfreq, (int, float)) or downsfreq <= 0:
+        raise ValueError("cfg.downsfreq must be positive")
+    if smooth and (not isinstance(overlap, int) or overlap <= 0 or overlap > T):
+        raise ValueError("cfg.overlap must be a positive integer <= T")
+
+    # Calculate buffer size
+    N = sfreq / downsfreq
+    if not N.is_integer():
+        N = round(N)
+        downsfreq = sfreq / N
+        logger.warning(f"sig_downsample - sfreq/downsfreq not integer, rounding: new downsampling frequency {downsfreq:.2f} Hz")
+
+    N = int(N)
+    if overlap >= N:
+        overlap = 1
+
+    step = N // overlap
+    nsamp = (T - N) // step + 1
+
+    # Time sample indices
+    tsamp = np.round(N / 2).astype(int) + np.arange(0, nsamp * step, step)
+
+    # Downsampling along the last axis, no reshape/transpose of the input
+    dtype = float_dtype(cfg)
+    with span('sig_downsample') as sp:
+        if not smooth:
+            sigbis = as_float(sig[..., tsamp], dtype)
+        else:
+            # Boxcar means over a strided window view: only the output is allocated, and the
+            # input (possibly memory-mapped) is read chunk by chunk
+            windows = sliding_window_view(sig, N, axis=-1)[..., ::step, :]
+            # Default dtype as np.mean: floating input keeps its precision, integers go to float64
+            default = sig.dtype if np.issubdtype(sig.dtype, np.inexact) else np.float64
+            sigbis = np.empty(sig.shape[:-1] + (nsamp,), dtype=cast_dtype(sig, dtype) or default)
+            chunk = max(1, cfg.get('chunk', 2 ** 20) // N)
+            for o0 in range(0, nsamp, chunk):
+                np.mean(windows[..., o0:o0 + chunk, :], axis=-1, out=sigbis[..., o0:o0 + chunk])
+        sp.alloc(sigbis)
+
+    return sigbis, tsamp
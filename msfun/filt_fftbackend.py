@@ -0,0 +1,44 @@
+import scipy.fft
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_overwrite = ContextVar('msfun_fft_overwrite', default=False)
+
+@contextmanager
+def msfun_filt_fftbackend(workers=None, overwrite_x=None):
+    """
+    Set the FFT backend used by every msfun_* function within a `with` block.
+
+    Parameters:
+    - workers: number of FFT threads (-1 = all cores); applies to every scipy.fft call in
+      the block, including scipy.signal.hilbert [default: unchanged]
+    - overwrite_x: allow FFTs to destroy the intermediate arrays they are given [default: unchanged]
+
+    A cfg passed to a function can override both with 'fft_workers' and 'fft_overwrite'.
+    """
+    token = _overwrite.set(bool(overwrite_x)) if overwrite_x is not None else None
+    try:
+        if workers is None:
+            yield
+        else:
+            with scipy.fft.set_workers(workers):
+                yield
+    finally:
+        if token is not None:
+            _overwrite.reset(token)
+
+def fft_workers(cfg=None):
+    """
+    FFT thread count for a call: cfg['fft_workers'] if set, else the backend default.
+    """
+    if isinstance(cfg, dict) and cfg.get('fft_workers') is not None:
+        return cfg['fft_workers']
+    return scipy.fft.get_workers()
+
+def fft_overwrite(cfg=None):
+    """
+    Whether FFTs may overwrite owned intermediates: cfg['fft_overwrite'] if set, else the backend default.
+    """
+    if isinstance(cfg, dict) and cfg.get('fft_overwrite') is not None:
+        return bool(cfg['fft_overwrite'])
+    return _overwrite.get()
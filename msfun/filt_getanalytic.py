@@ -0,0 +1,55 @@
+import numpy as np
+from scipy.fft import rfft, ifft
+from .filt_fftbackend import fft_workers, fft_overwrite
+from .filt_precision import float_dtype, as_float
+from .filt_instrument import logger
+
+def msfun_filt_getanalytic(X, dim=None):
+    """
+    Compute the analytic signal of real array X along dimension `dim`.
+
+    Parameters:
+    - X: real-valued numpy array
+    - dim: dimension along which to compute analytic signal (default = last)
+
+    Returns:
+    - Z: complex-valued analytic signal, complex128 (complex64 under
+      msfun_filt_precision('float32'))
+    """
+    if not isinstance(X, np.ndarray):
+        raise TypeError("Input must be a numpy array")
+
+    if not np.isrealobj(X):
+        logger.warning("sig_analytic - Input is not real. Using real part only.")
+        X = np.real(X)
+    X = as_float(X, float_dtype() or np.float64)
+
+    if dim is None:
+        dim = X.ndim - 1
+
+    if not isinstance(dim, int) or dim < 0 or dim >= X.ndim:
+        raise ValueError("Invalid dimension")
+
+    if X.shape[dim] == 1:
+        raise ValueError("Selected dimension contains only one sample")
+
+    n = X.shape[dim]
+
+    # One-sided spectrum: double the positive frequencies, keep DC (and Nyquist for even n)
+    workers = fft_workers()
+    Zf = rfft(X, axis=dim, workers=workers)
+    pos = [slice(None)] * X.ndim
+    pos[dim] = slice(1, (n + 1) // 2)
+    Zf[tuple(pos)] *= 2
+
+    # Inverse FFT to get analytic signal (zero-padding to n fills the negative frequencies)
+    Z = ifft(Zf, n=n, axis=dim, workers=workers, overwrite_x=fft_overwrite())
+    return Z
+
+def analytic_weights(n):
+    """
+    One-sided weights turning the n//2 + 1 rfft bins into the analytic-signal spectrum.
+    """
+    w = np.ones(n // 2 + 1)
+    w[1:(n + 1) // 2] = 2
+    return w
@@ -0,0 +1,114 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger('msfun')
+
+_sink = ContextVar('msfun_instrument_sink', default=None)
+_parent = ContextVar('msfun_instrument_parent', default='')
+
+@contextmanager
+def msfun_filt_instrument(callback=None):
+    """
+    Record timing spans of the msfun_* functions called within a `with` block.
+
+    Each finished span is passed to the callback as a dict with 'name', 'path' (names of
+    the enclosing spans joined by '/', e.g. 'sig_filter/fft'), 'start' and 'time' (s,
+    perf_counter) and 'bytes' (size of the arrays the stage allocated). Without a callback,
+    a Collector is used and yielded, e.g.:
+
+        with msfun_filt_instrument() as prof:
+            sig = msfun_sig_filter(sig, cfg)
+        prof.profile()
+
+    Outside such a block spans are no-ops; progress messages go to the 'msfun' logger
+    (logging.basicConfig(level=logging.INFO) to see them).
+    """
+    sink = Collector() if callback is None else callback
+    token = _sink.set(sink)
+    try:
+        yield sink
+    finally:
+        _sink.reset(token)
+
+def span(name):
+    """
+    Context manager timing one stage: `with span('fft') as sp: ...; sp.alloc(array)`.
+    """
+    sink = _sink.get()
+    if sink is None:
+        return _null_span
+    return _Span(sink, name)
+
+class Collector:
+    """
+    Span callback keeping every record, with a per-path profile summary.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, record):
+        self.records.append(record)
+
+    def profile(self):
+        """
+        {path: {'count', 'time', 'bytes'}} totals, in order of first completion.
+        """
+        prof = OrderedDict()
+        for rec in self.records:
+            p = prof.setdefault(rec['path'], {'count': 0, 'time': 0.0, 'bytes': 0})
+            p['count'] += 1
+            p['time'] += rec['time']
+            p['bytes'] += rec['bytes']
+        return prof
+
+    def to_json(self, path):
+        """
+        Write the records and the profile summary to a JSON file.
+        """
+        with open(path, 'w') as fid:
+            json.dump({'records': self.records, 'profile': self.profile()}, fid, indent=1)
+
+class _Span:
+    __slots__ = ('sink', 'name', 'path', 'nbytes', 't0', 'token')
+
+    def __init__(self, sink, name):
+        self.sink = sink
+        self.name = name
+        self.nbytes = 0
+
+    def __enter__(self):
+        parent = _parent.get()
+        self.path = parent + '/' + self.name if parent else self.name
+        self.token = _parent.set(self.path)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        t1 = time.perf_counter()
+        _parent.reset(self.token)
+        self.sink({'name': self.name, 'path': self.path, 'start': self.t0,
+                   'time': t1 - self.t0, 'bytes': self.nbytes})
+        return False
+
+    def alloc(self, *arrays):
+        for a in arrays:
+            self.nbytes += getattr(a, 'nbytes', 0)
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def alloc(self, *arrays):
+        pass
+
+_null_span = _NullSpan()
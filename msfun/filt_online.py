@@ -0,0 +1,246 @@
+import time
+import numpy as np
+from scipy.fft import fft, ifft, rfft, irfft, next_fast_len
+from .filt_applyfilter import resolve_filt
+from .filt_streamfilter import fir_ntaps, cosine_fir
+from .filt_removeleakage import OrthStatRegressor
+from .filt_fftbackend import fft_workers
+
+class OnlineProcessor:
+    """
+    Block-wise processing of a live stream with a fixed output delay.
+
+    The cosine band-pass (and, with 'analytic', the analytic-signal extraction) runs as one
+    zero-phase FIR of ntaps taps by overlap-save over a carried history of the last
+    ntaps - 1 input samples, so the response no longer depends on a total length T. The
+    output sample for input time t is ready once input time t + delay has been pushed,
+    delay = ntaps // 2, for every block. Leakage correction and downsampling are applied
+    to each filtered block with their state (regressor statistics, partial downsampling
+    buffer) carried over.
+
+    Parameters:
+    - cfg: dict with keys:
+        - sfreq: sampling rate (Hz)
+        - blocksize: number of samples per pushed block
+        - filt: band name (key of filt_map) or filter dict
+        - ntaps: (optional) odd FIR length [default ~8 samples per narrowest transition]
+        - analytic: True to output the complex analytic signal [default False]
+        - leakage: (optional) dict with 'method' ('custom' or 'orthstat'), 'y' (row indices
+          used as Y), optionally 'x' (rows corrected, default all) and
+            - custom: 'beta' (len(x), len(y))
+            - orthstat: 'regressor', a fitted OrthStatRegressor used as is; without it,
+              betas are re-estimated from all blocks seen so far
+        - downsfreq: (optional) output rate (Hz); 'smooth' True (default) averages each
+          buffer of sfreq / downsfreq samples, False picks its middle sample
+
+    Usage:
+    - proc = OnlineProcessor(cfg)
+    - for block in stream: out = proc.push(block)   # (C, n) array, n may be 0
+    - proc.flush() returns the outputs still held back by the delay
+    - proc.report() summarizes the per-block latencies and the output delay
+    """
+
+    def __init__(self, cfg):
+        if not isinstance(cfg, dict) or not all(k in cfg for k in ['sfreq', 'blocksize', 'filt']):
+            raise ValueError("cfg must contain 'sfreq', 'blocksize' and 'filt'")
+
+        self.cfg = dict(cfg)
+        self.sfreq = cfg['sfreq']
+        if not isinstance(self.sfreq, (int, float)) or self.sfreq <= 0:
+            raise ValueError("cfg.sfreq must be positive")
+
+        self.blocksize = cfg['blocksize']
+        if not isinstance(self.blocksize, (int, np.integer)) or self.blocksize <= 0:
+            raise ValueError("cfg.blocksize must be a positive integer")
+
+        filt = resolve_filt(cfg['filt'])
+        if filt is None:
+            raise ValueError("OnlineProcessor requires a filter, not 'none'")
+        self.ntaps = fir_ntaps(filt, self.sfreq, cfg.get('ntaps'))
+        self.delay = self.ntaps // 2
+        self.analytic = bool(cfg.get('analytic', False))
+
+        self.nfft = next_fast_len(self.blocksize + self.ntaps - 1, real=not self.analytic)
+        h = cosine_fir(filt, self.ntaps, self.sfreq, analytic=self.analytic)
+        self._H = fft(h, n=self.nfft) if self.analytic else rfft(h, n=self.nfft)
+
+        self.leakage = cfg.get('leakage')
+        if self.leakage is not None:
+            method = self.leakage.get('method', '').lower()
+            if method not in ['custom', 'orthstat']:
+                raise ValueError("leakage 'method' must be 'custom' or 'orthstat'")
+            if 'y' not in self.leakage:
+                raise ValueError("leakage requires the Y row indices 'y'")
+            if method == 'custom' and not isinstance(self.leakage.get('beta'), np.ndarray):
+                raise ValueError("'custom' leakage requires a 'beta' array")
+            self._regressor = self.leakage.get('regressor')
+            self._adaptive = method == 'orthstat' and self._regressor is None
+            if self._adaptive:
+                self._regressor = OrthStatRegressor()
+            self.leakage = dict(self.leakage, method=method)
+
+        self.N = None
+        downsfreq = cfg.get('downsfreq')
+        if downsfreq is not None:
+            if not isinstance(downsfreq, (int, float)) or downsfreq <= 0 or downsfreq > self.sfreq:
+                raise ValueError("cfg.downsfreq must be positive and at most cfg.sfreq")
+            self.N = int(round(self.sfreq / downsfreq))
+            self.smooth = cfg.get('smooth', True)
+
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the stream: zero history, no pending samples, empty latency record.
+        """
+        self._buf = None
+        self._pending = None
+        self._skip = self.delay
+        self._n_in = 0
+        self._n_out = 0
+        self.latency = []
+        if self.leakage is not None and self._adaptive:
+            self._regressor = OrthStatRegressor()
+
+    def push(self, block):
+        """
+        Process one (C, blocksize) block; returns the output samples that became ready.
+        """
+        t0 = time.perf_counter()
+        if not isinstance(block, np.ndarray) or block.ndim != 2 or block.shape[1] != self.blocksize:
+            raise ValueError(f"Each block must be a (C, {self.blocksize}) array")
+        self._n_in += self.blocksize
+        out = self._process(block)
+        self.latency.append(time.perf_counter() - t0)
+        return out
+
+    def flush(self):
+        """
+        Drain the outputs still held back by the delay (zero-padded end of stream); incomplete
+        downsampling buffers are dropped, as in msfun_filt_downsample.
+        """
+        if self._buf is None:
+            return None
+        C = self._buf.shape[0]
+        zeros = np.zeros((C, self.blocksize))
+        outs = []
+        while self._n_out < self._n_in:
+            outs.append(self._process(zeros))
+        return np.concatenate(outs, axis=1) if outs else zeros[:, :0]
+
+    def report(self):
+        """
+        Per-block latency summary against the real-time budget of one block.
+        """
+        lat = np.asarray(self.latency)
+        budget = self.blocksize / self.sfreq
+        return {'blocks': lat.size,
+                'mean': float(lat.mean()) if lat.size else None,
+                'max': float(lat.max()) if lat.size else None,
+                'budget': budget,
+                'overruns': int(np.sum(lat > budget)),
+                'delay_samples': self.delay,
+                'delay': self.delay / self.sfreq}
+
+    def _process(self, block):
+        B, L = self.blocksize, self.ntaps
+        if self._buf is None:
+            self._buf = np.zeros((block.shape[0], L - 1 + B))
+        elif self._buf.shape[0] != block.shape[0]:
+            raise ValueError("Channel count changed during the stream")
+
+        # Carried history of ntaps - 1 samples, then the new block
+        buf = self._buf
+        buf[:, :L - 1] = buf[:, B:]
+        buf[:, L - 1:] = block
+
+        workers = fft_workers(self.cfg)
+        if self.analytic:
+            Y = fft(buf, n=self.nfft, axis=-1, workers=workers)
+            Y *= self._H
+            y = ifft(Y, axis=-1, workers=workers, overwrite_x=True)[:, L - 1:L - 1 + B]
+        else:
+            Y = rfft(buf, n=self.nfft, axis=-1, workers=workers)
+            Y *= self._H
+            y = irfft(Y, n=self.nfft, axis=-1, workers=workers, overwrite_x=True)[:, L - 1:L - 1 + B]
+
+        # Outputs for negative times (before the first sample) are dropped once, at start-up
+        if self._skip:
+            drop = min(self._skip, B)
+            y = y[:, drop:]
+            self._skip -= drop
+        y = y[:, :self._n_in - self._n_out]
+        self._n_out += y.shape[1]
+
+        if self.leakage is not None and y.shape[1]:
+            y = self._correct(y)
+        if self.N is not None:
+            y = self._downsample(y)
+        return y
+
+    def _correct(self, y):
+        lk = self.leakage
+        rows = np.atleast_1d(lk.get('x', np.arange(y.shape[0])))
+        Y = y[np.atleast_1d(lk['y'])]
+        if lk['method'] == 'custom':
+            beta = lk['beta']
+        else:
+            if self._adaptive:
+                self._regressor.partial_fit(y[rows], Y)
+            beta = self._regressor.beta
+        y[rows] -= beta @ Y  # y is this block's own FFT output
+        return y
+
+    def _downsample(self, y):
+        N = self.N
+        if self._pending is not None and self._pending.shape[1]:
+            y = np.concatenate((self._pending, y), axis=1)
+        n = y.shape[1] // N
+        self._pending = y[:, n * N:]
+        groups = y[:, :n * N].reshape(y.shape[0], n, N)
+        if self.smooth:
+            return groups.mean(axis=-1)
+        return groups[:, :, int(np.round(N / 2))]
+
+def synthetic_stream(cfg):
+    """
+    Synthetic acquisition stream: yields (C, blocksize) blocks from a small ring buffer.
+
+    Every channel is an amplitude-modulated oscillation plus white noise; channels after the
+    first also contain a scaled copy of channel 0 (zero-lag leakage). Yielded blocks are
+    views of the ring slots and are overwritten nslots blocks later.
+
+    Parameters:
+    - cfg: dict with keys:
+        - sfreq, blocksize, nblocks: sampling rate (Hz), block size and number of blocks
+        - nchan: number of channels [default 4]
+        - freq: oscillation frequency (Hz) [default 10]
+        - modfreq: amplitude modulation frequency (Hz) [default 0.5]
+        - noise: noise standard deviation [default 0.5]
+        - leak: leakage of channel 0 into the other channels [default 0.5]
+        - nslots: ring buffer slots [default 4]
+        - realtime: True to pace the blocks at the acquisition rate [default False]
+        - seed: random seed
+    """
+    if not isinstance(cfg, dict) or not all(k in cfg for k in ['sfreq', 'blocksize', 'nblocks']):
+        raise ValueError("cfg must contain 'sfreq', 'blocksize' and 'nblocks'")
+
+    sfreq, B = cfg['sfreq'], cfg['blocksize']
+    C = cfg.get('nchan', 4)
+    rng = np.random.default_rng(cfg.get('seed'))
+    ring = np.empty((cfg.get('nslots', 4), C, B))
+    phase = rng.uniform(0, 2 * np.pi, C)[:, np.newaxis]
+    leak = np.full((C, 1), cfg.get('leak', 0.5))
+    leak[0] = 0
+
+    t_start = time.perf_counter()
+    for k in range(cfg['nblocks']):
+        t = (k * B + np.arange(B)) / sfreq
+        env = 1 + 0.5 * np.sin(2 * np.pi * cfg.get('modfreq', 0.5) * t + phase)
+        slot = ring[k % ring.shape[0]]
+        slot[...] = env * np.cos(2 * np.pi * cfg.get('freq', 10) * t + phase)
+        slot += cfg.get('noise', 0.5) * rng.standard_normal((C, B))
+        slot += leak * slot[0]
+        if cfg.get('realtime', False):
+            time.sleep(max(0, t_start + (k + 1) * B / sfreq - time.perf_counter()))
+        yield slot
@@ -0,0 +1,266 @@
+import time
+import tracemalloc
+import numpy as np
+from copy import deepcopy
+from scipy.fft import fft, ifft
+from .filt_preparecosine import msfun_filt_preparecosine
+from .filt_applyfilter import resolve_filt, filter_fft
+from .filt_getanalytic import analytic_weights
+from .filt_removeleakage import msfun_filt_removeleakage
+from .filt_downsample import msfun_filt_downsample
+from .filt_preprocfiff import msfun_filt_preprocfiff
+from .filt_preprocmff import msfun_filt_preprocmff
+from .filt_fftbackend import fft_workers
+from .filt_precision import float_dtype, as_float, complex_dtype
+
+stage_names = ['preprocfiff', 'preprocmff', 'filter', 'analytic', 'removeleakage', 'downsample']
+
+class Pipeline:
+    """
+    Chain of msfun_* processing stages built from a declarative config.
+
+    Stages and their parameters are validated once when the pipeline is built, shapes once
+    per input shape. Work buffers are allocated for the first input of a given shape and
+    reused by later stages and later runs: a filter followed by an analytic stage runs as a
+    single in-place complex transform, and leakage correction writes into the same buffer.
+
+    Parameters:
+    - cfg: dict with keys:
+        - sfreq: sampling rate (Hz) of the input (filled in by a preproc stage if omitted)
+        - stages: list of dicts, each with 'name' (one of stage_names) and that stage's settings:
+            - preprocfiff / preprocmff: 'cfg' passed to the reader (must be the first stage);
+              preprocmff also takes the nominal 'sfreq' passed to msfun_filt_preprocmff
+            - filter: 'filt' (band name or filter dict)
+            - analytic: no settings
+            - removeleakage: 'method' and its settings as for msfun_filt_removeleakage,
+              'y' (row indices used as Y) and optionally 'x' (rows corrected, default all)
+            - downsample: 'downsfreq', optional 'smooth' and 'overlap'
+        - profile: True to record per-stage time and memory high-water marks [default False];
+          before Python 3.9 the high-water mark is not reset between stages, so it covers
+          the run up to the end of each stage
+        - dtype: (optional) 'float32' or 'float64' precision kept by every stage, see
+          msfun_filt_precision
+
+    Usage:
+    - sig = Pipeline(cfg).run(sig), or .run(raw, times) / .run(times) after a preproc stage
+    - after a profiled run, .report lists {'stage', 'time', 'peak_bytes'} per stage
+    """
+
+    def __init__(self, cfg):
+        if not isinstance(cfg, dict) or not isinstance(cfg.get('stages'), list) or not cfg['stages']:
+            raise ValueError("cfg must contain a non-empty list of 'stages'")
+
+        self.cfg = deepcopy(cfg)
+        self.stages = self.cfg['stages']
+        self.report = []
+        self._buffers = {}
+        self._shape = None
+        self._sfreq = self.cfg.get('sfreq')
+        self._input = None
+        self._dtype = None
+        self.tsamp = None
+
+        complex_sig = False
+        for i, stage in enumerate(self.stages):
+            name = stage.get('name') if isinstance(stage, dict) else None
+            if name not in stage_names:
+                raise ValueError(f"Unknown pipeline stage: {name}")
+
+            if name.startswith('preproc'):
+                if i != 0:
+                    raise ValueError("A preproc stage must come first")
+                if not isinstance(stage.get('cfg'), dict):
+                    raise ValueError(f"Stage '{name}' requires a 'cfg' dict")
+                if name == 'preprocmff' and 'sfreq' not in stage:
+                    raise ValueError("Stage 'preprocmff' requires 'sfreq'")
+            elif name == 'filter':
+                if complex_sig:
+                    raise ValueError("The filter stage must come before the analytic stage")
+                stage['filt'] = resolve_filt(stage.get('filt'))
+            elif name == 'analytic':
+                if complex_sig:
+                    raise ValueError("The analytic stage can only be applied once")
+                complex_sig = True
+            elif name == 'removeleakage':
+                method = stage.get('method', '').lower()
+                if method not in ['gcs', 'orthinst', 'orthstat', 'custom']:
+                    raise ValueError("removeleakage 'method' must be one of 'gcs', 'orthinst', 'orthstat', 'custom'")
+                if method == 'orthinst' and not complex_sig:
+                    raise ValueError("'orthinst' leakage correction requires a preceding analytic stage")
+                if 'y' not in stage:
+                    raise ValueError("removeleakage requires the Y row indices 'y'")
+                stage['method'] = method
+            elif name == 'downsample':
+                if not isinstance(stage.get('downsfreq'), (int, float)) or stage['downsfreq'] <= 0:
+                    raise ValueError("downsample requires a positive 'downsfreq'")
+
+        if not self.stages[0]['name'].startswith('preproc'):
+            sfreq = self.cfg.get('sfreq')
+            if not isinstance(sfreq, (int, float)) or sfreq <= 0:
+                raise ValueError("cfg.sfreq must be positive")
+
+    def check(self, shape):
+        """
+        Validate the stages against an input of the given (C, T) or (K, C, T) shape.
+        """
+        if len(shape) not in [2, 3]:
+            raise ValueError("Signal must be 2D or 3D")
+
+        C, T = shape[-2], shape[-1]
+        sfreq = self._sfreq
+        for stage in self.stages:
+            if stage['name'] == 'removeleakage':
+                y = np.atleast_1d(stage['y'])
+                x = np.atleast_1d(stage.get('x', np.arange(C)))
+                if y.min() < 0 or y.max() >= C or x.min() < 0 or x.max() >= C:
+                    raise ValueError("removeleakage row indices out of range")
+                if stage['method'] == 'custom':
+                    beta = stage.get('beta')
+                    if not isinstance(beta, np.ndarray) or beta.shape != (len(x), len(y)):
+                        raise ValueError("removeleakage 'beta' must be array of shape (len(x), len(y))")
+                if stage['method'] == 'gcs' and len(y) != 1:
+                    raise ValueError("GCS method requires a single Y row")
+            elif stage['name'] == 'downsample':
+                N = round(sfreq / stage['downsfreq'])
+                if N > T:
+                    raise ValueError("downsample buffer longer than the signal")
+                T, sfreq = (T - N) // N + 1, sfreq / N
+
+        if self._shape != tuple(shape):
+            self._buffers = {}
+            self._shape = tuple(shape)
+
+    def run(self, *inputs):
+        """
+        Run every stage on the input and return the result (never a pipeline buffer).
+        """
+        self.report = []
+        self._sfreq = self.cfg.get('sfreq')
+        self._input = inputs[0] if inputs else None
+        self._dtype = float_dtype(self.cfg)
+        profile = self.cfg.get('profile', False)
+        started = profile and not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+
+        try:
+            x = inputs[0] if len(inputs) == 1 else None
+            stages = list(self.stages)
+            i = 0
+            while i < len(stages):
+                stage = stages[i]
+                fused = (stage['name'] == 'filter' and i + 1 < len(stages)
+                         and stages[i + 1]['name'] == 'analytic')
+                if profile:
+                    if hasattr(tracemalloc, 'reset_peak'):  # Python >= 3.9
+                        tracemalloc.reset_peak()
+                    base = tracemalloc.get_traced_memory()[0]
+                    t0 = time.perf_counter()
+
+                if stage['name'].startswith('preproc'):
+                    x = self._preproc(stage, inputs)
+                else:
+                    if i == 0:
+                        if not isinstance(x, np.ndarray):
+                            raise TypeError("Signal must be a numeric array")
+                        self.check(x.shape)
+                        x = as_float(x, self._dtype)
+                    x = getattr(self, '_' + stage['name'])(stage, x, fused)
+
+                if profile:
+                    peak = tracemalloc.get_traced_memory()[1] - base
+                    label = 'filter+analytic' if fused else stage['name']
+                    self.report.append({'stage': label, 'time': time.perf_counter() - t0,
+                                        'peak_bytes': max(int(peak), 0)})
+                i += 2 if fused else 1
+        finally:
+            if started:
+                tracemalloc.stop()
+
+        if any(np.shares_memory(x, buf) for buf in self._buffers.values()):
+            x = x.copy()
+        return x
+
+    def _buffer(self, name, shape, dtype):
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buf
+        return buf
+
+    def _preproc(self, stage, inputs):
+        pcfg = deepcopy(stage['cfg'])
+        if self._dtype is not None:
+            pcfg.setdefault('dtype', self._dtype)
+        if stage['name'] == 'preprocfiff':
+            if len(inputs) != 2:
+                raise ValueError("preprocfiff stage requires (raw, times) inputs")
+            raw, times = inputs
+            sig, pcfg = msfun_filt_preprocfiff(raw, times, pcfg)
+            self._sfreq = raw.info['sfreq']
+        else:
+            if len(inputs) != 1:
+                raise ValueError("preprocmff stage requires (times) input")
+            sig, pcfg = msfun_filt_preprocmff(inputs[0], stage['sfreq'], pcfg)
+            self._sfreq = pcfg['sfreq']
+        self.check(sig.shape)
+        return sig
+
+    def _filter(self, stage, x, fused):
+        filt = stage['filt']
+        T = x.shape[-1]
+        if fused:
+            # Band-pass and analytic weighting in one full-length mask, transformed in place
+            if filt is None:
+                win, F = np.ones(T, dtype=self._dtype), np.ones(T // 2 + 1)
+            else:
+                win, F = msfun_filt_preparecosine(filt, T, self._sfreq, onesided=True, cache=True, dtype=self._dtype)
+            H = np.zeros(T, dtype=self._dtype)
+            H[:T // 2 + 1] = F * analytic_weights(T)
+            return self._spectral_inplace(np.real(x), win, H)
+
+        if filt is None:
+            return x
+        win, F = msfun_filt_preparecosine(filt, T, self._sfreq, onesided=np.isrealobj(x), cache=True,
+                                          dtype=self._dtype)
+        return filter_fft(x * win, F, np.isrealobj(x), fft_workers(self.cfg), True)
+
+    def _analytic(self, stage, x, fused):
+        T = x.shape[-1]
+        H = np.zeros(T, dtype=self._dtype)
+        H[:T // 2 + 1] = analytic_weights(T)
+        return self._spectral_inplace(np.real(x), None, H)
+
+    def _spectral_inplace(self, x, win, H):
+        z = self._buffer('z', x.shape, complex_dtype(self._dtype or np.float64))
+        if win is None:
+            z[...] = x
+        else:
+            np.multiply(x, win, out=z)
+        workers = fft_workers(self.cfg)
+        z = fft(z, axis=-1, overwrite_x=True, workers=workers)
+        z *= H
+        return ifft(z, axis=-1, overwrite_x=True, workers=workers)
+
+    def _removeleakage(self, stage, x, fused):
+        if x is self._input:
+            x = x.copy()  # corrected in place below, never modify the caller's array
+        C = x.shape[-2]
+        rows = np.atleast_1d(stage.get('x', np.arange(C)))
+        cfg = {k: v for k, v in stage.items() if k not in ['name', 'x', 'y']}
+        cfg.setdefault('dtype', self._dtype)
+        epochs = x if x.ndim == 3 else x[np.newaxis]
+        for epoch in epochs:
+            X = epoch[rows]
+            Y = epoch[np.atleast_1d(stage['y'])]
+            epoch[rows] = msfun_filt_removeleakage(X, Y, cfg)
+        return x
+
+    def _downsample(self, stage, x, fused):
+        cfg = {k: v for k, v in stage.items() if k != 'name'}
+        cfg['sfreq'] = self._sfreq
+        cfg.setdefault('dtype', self._dtype)
+        sig, tsamp = msfun_filt_downsample(x, cfg)
+        self.tsamp = tsamp
+        self._sfreq = self._sfreq / round(self._sfreq / stage['downsfreq'])
+        return sig
@@ -0,0 +1,67 @@
+import numpy as np
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_dtype = ContextVar('msfun_dtype', default=None)
+
+@contextmanager
+def msfun_filt_precision(dtype):
+    """
+    Set the floating-point precision used by every msfun_* function within a `with` block.
+
+    Parameters:
+    - dtype: 'float32' to keep signals in float32 / complex64 (half the memory and memory
+      traffic), 'float64' for double precision throughout, or None for the default, where
+      each function promotes to float64 as it always did
+
+    A cfg passed to a function can override it with 'dtype'.
+    """
+    token = _dtype.set(_check(dtype))
+    try:
+        yield
+    finally:
+        _dtype.reset(token)
+
+def float_dtype(cfg=None):
+    """
+    Working real dtype for a call: cfg['dtype'] if set, else the msfun_filt_precision default
+    (None when neither is set).
+    """
+    if isinstance(cfg, dict) and cfg.get('dtype') is not None:
+        return _check(cfg['dtype'])
+    return _dtype.get()
+
+def as_float(x, dtype):
+    """
+    x cast to the dtype given by cast_dtype, without a copy when it already has it; x itself
+    when dtype is None.
+    """
+    if dtype is None:
+        return x
+    return np.asarray(x).astype(cast_dtype(x, dtype), copy=False)
+
+def cast_dtype(x, dtype):
+    """
+    dtype of the array x under the precision dtype: dtype, or its complex counterpart when x
+    is complex; None when dtype is None (as accepted by the dtype argument of numpy ufuncs).
+    """
+    if dtype is None:
+        return None
+    return complex_dtype(dtype) if np.iscomplexobj(x) else np.dtype(dtype)
+
+def complex_dtype(dtype):
+    """
+    Complex counterpart of a real dtype: complex64 for float32, complex128 for float64.
+    """
+    return np.result_type(dtype, np.complex64)
+
+def _check(dtype):
+    if dtype is None:
+        return None
+    try:
+        dtype = np.dtype(dtype)
+    except TypeError:
+        raise ValueError("dtype must be 'float32' or 'float64'")
+    if dtype not in (np.float32, np.float64):
+        raise ValueError("dtype must be 'float32' or 'float64'")
+    return dtype
@@ -0,0 +1,115 @@
+import numpy as np
+from collections import OrderedDict
+from threading import Lock
+
+def msfun_filt_preparecosine(opt, T, Fs, onesided=False, cache=False, dtype=None):
+    """
+    Compute the window and frequency filter matrix for FFT-based filtering.
+
+    With onesided=True only the T//2 + 1 non-negative frequencies are returned,
+    matching the output length of rfft for real-valued signals.
+    With cache=True the (read-only) arrays are served from cosine_cache.
+    With dtype set (e.g. float32) both arrays are cast to it, so that they do not promote
+    the signal they multiply.
+    """
+    if cache:
+        win, F = cosine_cache.get(opt, T, Fs, onesided)
+        if dtype is not None:
+            win, F = win.astype(dtype, copy=False), F.astype(dtype, copy=False)
+        return win, F
+
+    if opt['win'] == 'boxcar':
+        win = np.ones(T)
+    else:
+        from scipy.signal import get_window  # deferred: scipy.signal is slow to import
+        win = get_window(opt['win'], T)  # Create window
+    win = win.flatten()              # Ensure row vector
+
+    norm_freqs = np.array(opt['freq']) / Fs * 2
+    norm_widths = np.array(opt['width']) / Fs * 2
+
+    F = cos_filt(T, opt['par'], norm_freqs, norm_widths, onesided=onesided)
+    if dtype is not None:
+        win, F = win.astype(dtype, copy=False), F.astype(dtype, copy=False)
+    return win, F
+
+def cos_filt(quantum, par_list, f_vect, Ws_vect, onesided=False):
+    """
+    Generate cosine-shaped frequency filters.
+    """
+    f_vect = np.asarray(f_vect, dtype=float).reshape(-1, 1)
+    Ws_vect = np.asarray(Ws_vect, dtype=float).reshape(-1, 1)
+    par = np.asarray(par_list).reshape(-1, 1)
+    if not np.all(np.isin(par, ['low', 'high', 'notch'])):
+        raise ValueError("The filter must be 'low', 'high', or 'notch'")
+
+    # Position of each non-negative frequency bin within each transition band (0 below, 1 above)
+    flow = quantum * (f_vect - Ws_vect / 2) / 2
+    fhigh = quantum * (f_vect + Ws_vect / 2) / 2
+    bins = np.arange(quantum // 2 + 1)
+    x = np.clip((bins - flow) / (fhigh - flow), 0, 1)
+
+    F_mult = np.where(par == 'low', np.where(x < 1, np.cos(x * (np.pi / 2))**2, 0), 1.0)
+    F_mult = np.where(par == 'high', np.where(x > 0, np.sin(x * (np.pi / 2))**2, 0), F_mult)
+    F_mult = np.where(par == 'notch', np.cos(x * np.pi)**2, F_mult)
+    F_h = np.prod(F_mult, axis=0)
+
+    if onesided:
+        return F_h
+
+    # Mirror the positive frequencies onto the negative ones (F[k] = F[quantum - k])
+    return np.concatenate((F_h, F_h[(quantum + 1) // 2 - 1:0:-1]))
+
+class CosineFilterCache:
+    """
+    Bounded, thread-safe LRU cache of read-only (window, filter) pairs from msfun_filt_preparecosine.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, opt, T, Fs, onesided=False):
+        key = (_freeze(opt['win']), _freeze(opt['par']), _freeze(opt['freq']),
+               _freeze(opt['width']), int(T), float(Fs), bool(onesided))
+
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        win, F = msfun_filt_preparecosine(opt, T, Fs, onesided=onesided)
+        win.setflags(write=False)
+        F.setflags(write=False)
+
+        with self._lock:
+            self._data[key] = (win, F)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return win, F
+
+    def info(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'maxsize': self.maxsize, 'currsize': len(self._data)}
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+def _freeze(val):
+    if isinstance(val, (list, tuple, np.ndarray)):
+        return tuple(_freeze(v) for v in val)
+    if isinstance(val, (int, float, np.number)) and not isinstance(val, bool):
+        return float(val)
+    return val
+
+cosine_cache = CosineFilterCache()
@@ -0,0 +1,196 @@
+import numpy as np
+from .filt_preparecosine import msfun_filt_preparecosine
+from .filt_applyfilter import filter_fft
+from .filt_fftbackend import fft_workers, fft_overwrite
+from .filt_precision import float_dtype
+from .filt_instrument import logger, span
+
+def msfun_filt_preprocfiff(raw: 'mne.io.Raw', times, cfg):
+    """
+    Reads and preprocesses signals from an MNE Raw object with selected channels and time samples.
+
+    Parameters:
+    - raw: MNE Raw object
+    - times: array of shape (T,) for continuous data, or (K, T) for K epochs (K may be 1)
+    - cfg: dictionary with at least 'chans' and optional 'filter', 'filt', 'blc' and 'dtype'
+      ('float32' or 'float64' precision of sig, see msfun_filt_precision)
+
+    Returns:
+    - sig: processed signal array, (C, T) or (K, C, T)
+    - cfg: updated configuration
+    """
+
+    if raw is None or times is None or cfg is None:
+        raise ValueError("sig_preprocess_fiff requires 3 inputs")
+
+    if 'chans' not in cfg:
+        raise ValueError("cfg must contain a list of channels as 'chans'")
+
+    if isinstance(cfg['chans'], str):
+        cfg['chans'] = [cfg['chans']]
+
+    cfg.setdefault('filter', False)
+    cfg.setdefault('blc', False)
+
+    if cfg['filter']:
+        f = cfg.get('filt', {})
+        if not all(k in f for k in ['win', 'par', 'freq', 'width']):
+            raise ValueError("Missing required filter parameters in cfg['filt']")
+        if not (len(f['par']) == len(f['freq']) == len(f['width'])):
+            raise ValueError("Mismatch in lengths of filter parameters")
+
+    # Match channel names
+    all_chs = raw.info['ch_names']
+    chan_inds = [all_chs.index(ch) for ch in cfg['chans'] if ch in all_chs]
+    cfg['signal'] = {
+        'chan': chan_inds,
+        'ind': [i for i, ch in enumerate(cfg['chans']) if ch in all_chs],
+        'names': [cfg['chans'][i] for i in range(len(cfg['chans'])) if cfg['chans'][i] in all_chs]
+    }
+
+    if not cfg['signal']['chan']:
+        logger.warning("sig_preprocess_fiff - No channels read... Returning empty output.")
+        return np.array([]), cfg
+
+    # Read only the sample spans covered by times, straight into the output
+    logger.info("sig_preprocess_fiff - Reading data...")
+    times = np.asarray(times)
+    T = (times * raw.info['sfreq']).astype(int) - raw.first_samp
+    if T.size and (T.min() < 0 or T.max() >= raw.n_times):
+        raise ValueError("times fall outside the recording")
+
+    with span('preprocfiff'):
+        logger.info("sig_preprocess_fiff - Getting the right time samples...")
+        read = lambda start, stop: raw[cfg['signal']['chan'], start:stop][0]
+        sig = gather_samples(read, T, len(cfg['signal']['chan']), cfg.get('maxgap', int(raw.info['sfreq'])),
+                             float_dtype(cfg) or np.float64)
+
+        # Filter if requested
+        if cfg['filter']:
+            logger.info("sig_preprocess_fiff - Filtering data...")
+            sig = preproc_filter(sig, cfg, raw.info['sfreq'])
+
+        # Baseline correction
+        if cfg['blc']:
+            logger.info("sig_preprocess_fiff - Applying baseline correction...")
+            with span('baseline'):
+                baseline_correct(sig, T)
+
+    logger.info("sig_preprocess_fiff - Data preprocessed and ready.")
+    return sig, cfg
+
+def gather_samples(read, T, n_ch, maxgap=0, dtype=np.float64):
+    """
+    Assemble the samples T, shape (L,) or (K, L), into a (C, L) or (K, C, L) array of dtype,
+    calling read(start, stop) -> (C, stop - start) once per span from read_spans.
+
+    Epochs of consecutive samples are copied out of strided windows of each span; other
+    samples are gathered with a single take when one span covers them all.
+    """
+    with span('gather') as sp:
+        if T.ndim == 2 and T.size and np.all(T[:, 1:] - T[:, :-1] == 1):
+            sig = _gather_epochs(read, T[:, 0], n_ch, T.shape[1], maxgap, dtype)
+            sp.alloc(sig)
+            return sig
+        sig = np.empty((n_ch, T.shape[0]) if T.ndim == 1 else (T.shape[0], n_ch, T.shape[1]), dtype=dtype)
+        sp.alloc(sig)
+        flat = T.ravel()
+        order = np.argsort(flat, kind='stable')
+        samp = flat[order]
+        spans = read_spans(samp, maxgap)
+        if len(spans) == 1:
+            start, stop = spans[0]
+            out = sig if T.ndim == 1 else sig.transpose(1, 0, 2)
+            # _read checked the span length, so 'clip' never clips here (and, unlike 'raise',
+            # does not buffer out)
+            np.take(_read(read, start, stop, sig.dtype), T - start, axis=1, out=out, mode='clip')
+            return sig
+        for start, stop in spans:
+            lo, hi = np.searchsorted(samp, [start, stop])
+            data = _read(read, start, stop, sig.dtype)[:, samp[lo:hi] - start]
+            if T.ndim == 1:
+                sig[:, order[lo:hi]] = data
+            else:
+                k, l = np.divmod(order[lo:hi], T.shape[1])
+                sig[k, :, l] = data.T
+    return sig
+
+def _gather_epochs(read, onsets, n_ch, L, maxgap, dtype):
+    # Epoch k is samples onsets[k] + arange(L): read the spans of the sorted onsets, each
+    # extended by L - 1 samples, and index epochs out of an (n, C, L) sliding-window view
+    sig = np.empty((len(onsets), n_ch, L), dtype=dtype)
+    order = np.argsort(onsets, kind='stable')
+    first = onsets[order]
+    spans = read_spans(first, maxgap + L - 1)
+    for start, stop in spans:
+        data = _read(read, start, stop + L - 1, sig.dtype)
+        windows = np.lib.stride_tricks.sliding_window_view(data, L, axis=1).transpose(1, 0, 2)
+        if len(spans) == 1:
+            return windows[onsets - start]
+        lo, hi = np.searchsorted(first, [start, stop])
+        sig[order[lo:hi]] = windows[first[lo:hi] - start]
+    return sig
+
+def _read(read, start, stop, dtype):
+    with span('read') as sp:
+        data = np.asarray(read(start, stop), dtype=dtype)
+        sp.alloc(data)
+    if data.shape[-1] != stop - start:
+        raise ValueError(f"read({start}, {stop}) returned {data.shape[-1]} samples: times fall outside the recording")
+    return data
+
+def preproc_filter(sig, cfg, sfreq, block=2**16):
+    """
+    Cosine-filter sig, (C, L) or (K, C, L), along time with cfg['filt'], in place.
+
+    Epochs are windowed and transformed in batches of about block samples, one FFT call per
+    batch, which keeps the spectra cache-sized instead of tripling the memory of sig.
+    """
+    win, F = msfun_filt_preparecosine(cfg['filt'], sig.shape[-1], sfreq, onesided=True, cache=True, dtype=sig.dtype)
+    workers, overwrite_x = fft_workers(cfg), fft_overwrite(cfg)
+    if sig.ndim == 2:
+        with span('window'):
+            sig *= win
+        return filter_fft(sig, F, True, workers, overwrite_x)
+    step = max(1, block // max(1, sig.shape[1] * sig.shape[2]))
+    for k in range(0, sig.shape[0], step):
+        x = sig[k:k + step]
+        with span('window'):
+            x *= win
+        x[...] = filter_fft(x, F, True, workers, overwrite_x)
+    return sig
+
+def baseline_correct(sig, T):
+    """
+    Subtract in place the time average of each epoch of sig (K, C, L), or, for a continuous
+    sig (C, L) read at samples T (L,), of each run of consecutive samples between jumps in T.
+    Averages are accumulated in float64 whatever the dtype of sig.
+    """
+    if sig.size == 0:
+        return sig
+    if sig.ndim == 3:
+        sig -= sig.mean(axis=-1, keepdims=True, dtype=np.float64)
+        return sig
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(T) > 1) + 1))
+    if len(starts) == 1:
+        sig -= sig.mean(axis=1, keepdims=True, dtype=np.float64)
+        return sig
+    counts = np.diff(np.append(starts, sig.shape[1]))
+    avg = np.add.reduceat(sig, starts, axis=1, dtype=np.float64)
+    avg /= counts
+    # One run at a time, so no temporary the size of sig is built
+    for s, n, a in zip(starts, counts, avg.T):
+        sig[:, s:s + n] -= a[:, np.newaxis]
+    return sig
+
+def read_spans(samp, maxgap=0):
+    """
+    Contiguous [start, stop) sample spans covering the sorted sample indices samp,
+    merging spans separated by fewer than maxgap unread samples into one read.
+    """
+    if samp.size == 0:
+        return []
+    breaks = np.where(np.diff(samp) > maxgap + 1)[0]
+    starts = np.concatenate(([samp[0]], samp[breaks + 1]))
+    stops = np.concatenate((samp[breaks], [samp[-1]])) + 1
+    return list(zip(starts.tolist(), stops.tolist()))
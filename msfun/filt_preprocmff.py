@@ -0,0 +1,159 @@
+import numpy as np
+from .filt_preprocfiff import gather_samples, preproc_filter, baseline_correct
+from .filt_precision import float_dtype
+from .filt_instrument import logger, span
+import hashlib
+import json
+import os
+
+def msfun_filt_preprocmff(times, sfreq, cfg):
+    """
+    Reads and preprocesses signals from an MFF file with selected channels and time samples.
+
+    Parameters:
+    - times: array of shape (T,) for continuous data, or (K, T) for K epochs (K may be 1)
+    - sfreq: sampling frequency (Hz)
+    - cfg: dictionary with at least 'mff_file' and 'chans', optional 'filter', 'filt', 'blc',
+      'maxgap', 'cache_dir' (directory of decoded-sample caches, see mff_cache) and 'dtype'
+      ('float32' or 'float64' precision of sig, see msfun_filt_precision)
+
+    Returns:
+    - sig: preprocessed signal array, (C, T) or (K, C, T) as for msfun_filt_preprocfiff
+    - cfg: updated configuration
+    """
+    if not isinstance(times, np.ndarray):
+        raise ValueError("times must be a numeric numpy array")
+    if not isinstance(sfreq, (int, float)) or sfreq <= 0:
+        raise ValueError("sfreq must be a positive scalar")
+    if not isinstance(cfg, dict) or 'mff_file' not in cfg or 'chans' not in cfg:
+        raise ValueError("cfg must contain 'mff_file' and 'chans'")
+
+    if isinstance(cfg['chans'], str):
+        cfg['chans'] = [cfg['chans']]
+
+    if not cfg['mff_file'].endswith('.mff'):
+        raise ValueError("cfg.mff_file must end with '.mff'")
+
+    cfg.setdefault('filter', False)
+    cfg.setdefault('blc', False)
+
+    if cfg['filter']:
+        f = cfg.get('filt', {})
+        if not all(k in f for k in ['win', 'par', 'freq', 'width']):
+            raise ValueError("Missing required filter parameters in cfg['filt']")
+        if not (len(f['par']) == len(f['freq']) == len(f['width'])):
+            raise ValueError("Mismatch in lengths of filter parameters")
+
+    # Read raw MFF using MNE (Fieldtrip equivalent), picking channels before any data is loaded
+    logger.info("eeg_preprocess_mff - Reading data (using MNE)...")
+    if cfg.get('cache_dir'):
+        data, ch_names, sfreq = mff_cache(cfg['mff_file'], cfg['cache_dir'])
+        missing = [ch for ch in cfg['chans'] if ch not in ch_names]
+        if missing:
+            raise ValueError(f"Channels not found in {cfg['mff_file']}: {missing}")
+        chan = [ch_names.index(ch) for ch in cfg['chans']]
+        read = lambda start, stop: data[chan, start:stop]
+        n_times = data.shape[1]
+    else:
+        import mne
+        raw = mne.io.read_raw_egi(cfg['mff_file'], preload=False, verbose='ERROR')
+        raw.pick_channels(cfg['chans'])
+        sfreq = raw.info['sfreq']
+        read = lambda start, stop: raw.get_data(start=start, stop=stop)
+        n_times = raw.n_times
+
+    cfg['sfreq'] = sfreq
+
+    # Time sample selection (only the spans covered by times are decoded)
+    with span('preprocmff'):
+        logger.info("msfun_msfun_filt_preprocmff - Getting the right time samples...")
+        T = (times * sfreq).astype(int)
+        T = T - T.min()
+        if T.max() >= n_times:
+            raise ValueError("times fall outside the recording")
+        sig = gather_samples(read, T, len(cfg['chans']), cfg.get('maxgap', int(sfreq)), float_dtype(cfg) or np.float64)
+
+        # Filtering
+        if cfg['filter']:
+            logger.info("msfun_msfun_filt_preprocmff - Filtering data...")
+            sig = preproc_filter(sig, cfg, sfreq)
+
+        # Baseline correction
+        if cfg['blc']:
+            logger.info("msfun_msfun_filt_preprocmff - Applying baseline correction...")
+            with span('baseline'):
+                baseline_correct(sig, T)
+
+    logger.info("msfun_msfun_filt_preprocmff - Data preprocessed and ready.")
+    return sig, cfg
+
+def mff_cache(mff_file, cache_dir):
+    """
+    Memory-mapped decoded samples of an MFF recording, decoding it once into cache_dir.
+
+    The cache is a (chan, time) float64 .npy file plus a .json sidecar holding the channel
+    names, sampling rate and the size/mtime signature of the MFF bundle; it is rebuilt
+    whenever the signature no longer matches.
+
+    Returns:
+    - data: read-only np.memmap of shape (C, T)
+    - ch_names: list of channel names
+    - sfreq: sampling frequency (Hz)
+    """
+    path = os.path.abspath(mff_file)
+    npy_file, meta_file = mff_cache_files(mff_file, cache_dir)
+    base = npy_file[:-len('.npy')]
+    signature = _mff_signature(path)
+
+    meta = None
+    if os.path.exists(npy_file) and os.path.exists(meta_file):
+        with open(meta_file) as fid:
+            meta = json.load(fid)
+        if meta.get('signature') != signature:
+            meta = None
+
+    if meta is None:
+        logger.info("eeg_preprocess_mff - Decoding MFF into cache...")
+        os.makedirs(cache_dir, exist_ok=True)
+        import mne
+        raw = mne.io.read_raw_egi(path, preload=False, verbose='ERROR')
+        tmp_file = base + '.tmp.npy'
+        out = np.lib.format.open_memmap(tmp_file, mode='w+', dtype=np.float64,
+                                        shape=(len(raw.ch_names), int(raw.n_times)))
+        step = max(1, int(raw.info['sfreq']) * 60)
+        for start in range(0, int(raw.n_times), step):
+            out[:, start:start + step] = raw.get_data(start=start, stop=start + step)
+        out.flush()
+        del out
+        os.replace(tmp_file, npy_file)
+
+        meta = {'mff_file': path, 'signature': signature,
+                'ch_names': raw.ch_names, 'sfreq': float(raw.info['sfreq'])}
+        with open(meta_file + '.tmp', 'w') as fid:
+            json.dump(meta, fid)
+        os.replace(meta_file + '.tmp', meta_file)
+
+    data = np.load(npy_file, mmap_mode='r')
+    return data, meta['ch_names'], meta['sfreq']
+
+def mff_cache_files(mff_file, cache_dir):
+    """
+    Paths of the .npy samples and .json sidecar caching mff_file in cache_dir.
+    """
+    path = os.path.abspath(mff_file)
+    tag = hashlib.sha1(path.encode()).hexdigest()[:12]
+    base = os.path.join(cache_dir, f"{os.path.basename(path.rstrip(os.sep))}-{tag}")
+    return base + '.npy', base + '.json'
+
+def _mff_signature(path):
+    # An .mff recording is a directory bundle: sign it by the size and mtime of every file
+    if os.path.isfile(path):
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+    size, mtime = 0, 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            st = os.stat(os.path.join(root, name))
+            size += st.st_size
+            mtime = max(mtime, st.st_mtime_ns)
+    return [size, mtime]
@@ -0,0 +1,237 @@
+import hashlib
+import os
+import numpy as np
+from .filt_precision import float_dtype, as_float
+
+def msfun_filt_removeleakage(X, Y, cfg):
+    """
+    Apply leakage correction from signal Y to signal X.
+
+    Parameters:
+    - X: array (N, T)
+    - Y: array (M, T)
+    - cfg: dictionary with keys:
+        - method: 'gcs', 'orthinst', 'orthstat', or 'custom'
+        - cfg.gcs: for 'gcs', contains 'ind' and either 'inv' or a precomputed 'operator' (GCSOperator)
+        - cfg.beta: for 'custom', shape (N, M)
+        - dtype: (optional) 'float32' or 'float64' working precision, see msfun_filt_precision
+
+    Returns:
+    - Z: corrected signal (N, T)
+    """
+
+    if not (isinstance(X, np.ndarray) and isinstance(Y, np.ndarray)):
+        raise TypeError("X and Y must be numpy arrays")
+
+    if X.ndim != 2 or Y.ndim != 2 or X.shape[1] != Y.shape[1]:
+        raise ValueError("X and Y must be 2D arrays with matching time dimension")
+
+    method = cfg.get('method', '').lower()
+    if method not in ['gcs', 'orthinst', 'orthstat', 'custom']:
+        raise ValueError("cfg['method'] must be one of 'gcs', 'orthinst', 'orthstat', 'custom'")
+
+    dtype = float_dtype(cfg)
+    X, Y = as_float(X, dtype), as_float(Y, dtype)
+
+    if method == 'gcs':
+        if Y.shape[0] != 1:
+            raise ValueError("GCS method requires Y to have shape (1, T)")
+        gcs = cfg.get('gcs', {})
+        ind = gcs.get('ind', None)
+
+        if isinstance(gcs.get('operator'), GCSOperator):
+            beta = gcs['operator'].beta_for(ind)
+        else:
+            inv = gcs.get('inv', {})
+            if not (isinstance(ind, int) and ind >= 1 and _valid_inv(inv) and
+                    ind <= inv['nsource']):
+                raise ValueError("Missing or invalid GCS configuration")
+
+            beta = inv['invop'] @ inv['leadfield'][:, ind - 1]
+            beta = beta / beta[ind - 1]
+        Z = X - np.outer(as_float(beta, dtype), Y[0])
+
+    elif method == 'orthstat':
+        beta = orthstat_beta(X.real @ Y.real.T, Y.real @ Y.real.T)
+        Z = X - beta @ Y
+
+    elif method == 'orthinst':
+        if np.isrealobj(X) and np.isrealobj(Y):
+            raise ValueError("X and Y must be complex for 'orthinst'")
+        ratio = np.sum(Y**2, axis=0) / np.sum(np.abs(Y)**2, axis=0)
+        ratio = ratio[np.newaxis, :]  # broadcast shape
+        Z = 0.5 * (X - np.conj(X) * ratio)
+
+    elif method == 'custom':
+        beta = cfg.get('beta')
+        if not isinstance(beta, np.ndarray) or beta.shape != (X.shape[0], Y.shape[0]):
+            raise ValueError("cfg['beta'] must be array of shape (N, M)")
+        Z = X - as_float(beta, dtype) @ Y
+
+    return Z
+
+def orthstat_beta(XY, YY):
+    """
+    Solve beta @ YY = XY for the 'orthstat' regression weights.
+
+    Uses a Cholesky factorization of the (symmetric) YY, falling back to the
+    pseudo-inverse when YY is singular. The system is solved in double precision and beta
+    returned in the precision of XY and YY.
+    """
+    from scipy.linalg import cho_factor, cho_solve, LinAlgError
+    dtype = np.result_type(XY, YY)
+    XY, YY = np.asarray(XY, dtype=np.float64), np.asarray(YY, dtype=np.float64)
+    try:
+        beta = cho_solve(cho_factor(YY), XY.T).T
+    except LinAlgError:
+        beta = XY @ np.linalg.pinv(YY)
+    return beta.astype(dtype, copy=False)
+
+class OrthStatRegressor:
+    """
+    Incremental 'orthstat' leakage correction.
+
+    Accumulates the sufficient statistics X.real @ Y.real.T and Y.real @ Y.real.T over
+    streamed chunks or epochs (partial_fit), solves for beta once (cached until more data
+    is accumulated), and applies Z = X - beta @ Y chunk by chunk (transform).
+
+    Usage:
+    - reg = OrthStatRegressor()
+    - for X, Y in chunks: reg.partial_fit(X, Y)
+    - for X, Y in chunks: Z = reg.transform(X, Y)
+    """
+
+    def __init__(self):
+        self.XY = None
+        self.YY = None
+        self.n_samples = 0
+        self._beta = None
+
+    def partial_fit(self, X, Y):
+        """
+        Accumulate a chunk: X (N, T) / (K, N, T) and Y (M, T) / (K, M, T).
+        """
+        X, Y = _check_chunk(X, Y)
+        Xr = X.real.transpose(1, 0, 2).reshape(X.shape[1], -1) if X.ndim == 3 else X.real
+        Yr = Y.real.transpose(1, 0, 2).reshape(Y.shape[1], -1) if Y.ndim == 3 else Y.real
+
+        if self.XY is None:
+            self.XY = np.zeros((Xr.shape[0], Yr.shape[0]))
+            self.YY = np.zeros((Yr.shape[0], Yr.shape[0]))
+        elif self.XY.shape != (Xr.shape[0], Yr.shape[0]):
+            raise ValueError("Chunk channel counts differ from the accumulated ones")
+
+        self.XY += Xr @ Yr.T
+        self.YY += Yr @ Yr.T
+        self.n_samples += Xr.shape[1]
+        self._beta = None
+        return self
+
+    @property
+    def beta(self):
+        if self.XY is None:
+            raise ValueError("No data accumulated: call partial_fit first")
+        if self._beta is None:
+            self._beta = orthstat_beta(self.XY, self.YY)
+        return self._beta
+
+    def transform(self, X, Y):
+        """
+        Corrected chunk Z = X - beta @ Y, same shape as X.
+        """
+        X, Y = _check_chunk(X, Y)
+        beta = self.beta
+        if beta.shape != (X.shape[-2], Y.shape[-2]):
+            raise ValueError("Chunk channel counts differ from the fitted ones")
+        dtype = float_dtype()
+        return as_float(X, dtype) - as_float(beta, dtype) @ as_float(Y, dtype)
+
+def _check_chunk(X, Y):
+    if not (isinstance(X, np.ndarray) and isinstance(Y, np.ndarray)):
+        raise TypeError("X and Y must be numpy arrays")
+    if X.ndim != Y.ndim or X.ndim not in [2, 3] or X.shape[-1] != Y.shape[-1] or X.shape[:-2] != Y.shape[:-2]:
+        raise ValueError("X and Y must be 2D or 3D arrays with matching epoch and time dimensions")
+    return X, Y
+
+class GCSOperator:
+    """
+    Precomputed 'gcs' leakage-correction betas for many seeds.
+
+    The normalized beta of every selected seed is computed with a single matrix-matrix
+    product invop @ leadfield[:, seeds - 1]; with cache_dir set, the (nsource, nseed) table
+    is stored as a .npy file keyed on a hash of the inverse operator and memory-mapped back.
+
+    Parameters:
+    - inv: dict with 'nsource', 'invop' (nsource, nsensor) and 'leadfield' (nsensor, nsource)
+    - seeds: 1-based seed source indices [default: all sources]
+    - cache_dir: (optional) directory of the beta table cache
+    """
+
+    def __init__(self, inv, seeds=None, cache_dir=None):
+        if not _valid_inv(inv):
+            raise ValueError("Missing or invalid GCS configuration")
+
+        nsource = inv['nsource']
+        seeds = np.arange(1, nsource + 1) if seeds is None else np.atleast_1d(np.asarray(seeds, dtype=int))
+        if seeds.ndim != 1 or seeds.size == 0 or seeds.min() < 1 or seeds.max() > nsource:
+            raise ValueError("GCS seeds must be 1-based source indices")
+        self.seeds = seeds
+        self._col = {int(ind): k for k, ind in enumerate(seeds)}
+
+        path = None
+        if cache_dir is not None:
+            path = os.path.join(cache_dir, f"gcs-{_inv_hash(inv, seeds)}.npy")
+            if os.path.exists(path):
+                self.beta = np.load(path, mmap_mode='r')
+                return
+
+        beta = inv['invop'] @ inv['leadfield'][:, seeds - 1]
+        beta /= beta[seeds - 1, np.arange(seeds.size)]
+
+        if path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = path[:-len('.npy')] + '.tmp.npy'
+            np.save(tmp, beta)
+            os.replace(tmp, path)
+            beta = np.load(path, mmap_mode='r')
+        self.beta = beta
+
+    def beta_for(self, ind):
+        """
+        Normalized beta (nsource,) of the 1-based seed index ind.
+        """
+        if ind not in self._col:
+            raise ValueError(f"Seed {ind} was not precomputed in this GCS operator")
+        return self.beta[:, self._col[ind]]
+
+    def apply(self, X, Y, seeds=None):
+        """
+        Correct X (N, T) for the leakage of every seed at once.
+
+        Y holds one row per seed (nseed, T) in the order of seeds (default: all operator seeds).
+        Returns Z of shape (nseed, N, T) with Z[k] = X - outer(beta_k, Y[k]).
+        """
+        seeds = self.seeds if seeds is None else np.atleast_1d(seeds)
+        if not (isinstance(X, np.ndarray) and isinstance(Y, np.ndarray)):
+            raise TypeError("X and Y must be numpy arrays")
+        if X.ndim != 2 or Y.ndim != 2 or X.shape[1] != Y.shape[1] or Y.shape[0] != len(seeds):
+            raise ValueError("X must be (N, T) and Y (nseed, T) with matching time dimension")
+        if X.shape[0] != self.beta.shape[0]:
+            raise ValueError("X must have one row per source")
+
+        dtype = float_dtype()
+        X, Y = as_float(X, dtype), as_float(Y, dtype)
+        B = as_float(np.stack([self.beta_for(int(ind)) for ind in seeds], axis=0), dtype)  # (nseed, N)
+        return X[np.newaxis, :, :] - B[:, :, np.newaxis] * Y[:, np.newaxis, :]
+
+def _valid_inv(inv):
+    return ('nsource' in inv and 'invop' in inv and 'leadfield' in inv and
+            inv['invop'].shape[0] == inv['nsource'])
+
+def _inv_hash(inv, seeds):
+    h = hashlib.sha1()
+    for arr in [inv['invop'], inv['leadfield'], seeds]:
+        arr = np.ascontiguousarray(arr)
+        h.update(str((arr.shape, arr.dtype.str)).encode())
+        h.update(arr.tobytes())
+    return h.hexdigest()[:16]
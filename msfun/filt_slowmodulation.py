@@ -0,0 +1,75 @@
+import numpy as np
+from scipy.fft import rfft, fft, ifft
+from .filt_getanalytic import analytic_weights
+from .filt_fftbackend import fft_workers
+
+def msfun_filt_slowmodulation(Z, fcenter, cfg=None):
+    """
+    Remove fast oscillation at fcenter from signal Z, keeping only slow modulations.
+
+    Demodulation is a rotation of the spectrum: the (analytic) spectrum is computed once and,
+    for each fcenter, its bins are read fcenter - 1 positions further before the inverse FFT.
+    With cfg['downsfreq'], only the bins within the output Nyquist band around fcenter are
+    kept, so the slow modulation comes out cropped and decimated.
+
+    Parameters:
+    - Z: real or analytic signal, shape (C, T) or (K, C, T)
+    - fcenter: frequency index to remove, or vector of frequency indices
+    - cfg: (optional) dict with keys:
+        - sfreq, downsfreq: sampling rate (Hz) of Z and of the output; cfg['tsamp'] and the
+          effective cfg['downsfreq'] are filled in
+
+    Returns:
+    - Zslow: signal with fast oscillation removed, keeping slow modulations; shape of Z
+      for a scalar fcenter, (F, [K,] C, T) for a vector of F frequency indices
+    """
+    if Z is None or fcenter is None:
+        raise ValueError("sig_slow_modulation requires two arguments")
+
+    if not isinstance(Z, np.ndarray) or Z.ndim not in [2, 3]:
+        raise ValueError("Z must be a numeric array with 2 or 3 dimensions")
+
+    T = Z.shape[-1]
+    is_analytic = np.iscomplexobj(Z)
+
+    scalar = isinstance(fcenter, (int, np.integer))
+    fc = np.atleast_1d(fcenter)
+    if fc.ndim != 1 or not fc.size or not np.issubdtype(fc.dtype, np.integer) or fc.min() < 1 or fc.max() > T:
+        raise ValueError("fcenter must be a positive integer index within the time axis length")
+
+    M = T
+    if cfg is not None and cfg.get('downsfreq') is not None:
+        sfreq, downsfreq = cfg.get('sfreq'), cfg['downsfreq']
+        if not isinstance(sfreq, (int, float)) or sfreq <= 0:
+            raise ValueError("cfg.sfreq must be positive")
+        if not isinstance(downsfreq, (int, float)) or downsfreq <= 0 or downsfreq > sfreq:
+            raise ValueError("cfg.downsfreq must be positive and at most cfg.sfreq")
+        M = max(1, int(round(T * downsfreq / sfreq)))
+        cfg['tsamp'] = np.round(np.arange(M) * T / M).astype(int)
+        cfg['downsfreq'] = sfreq * M / T
+
+    workers = fft_workers(cfg)
+    if is_analytic:
+        Zf = fft(Z, axis=-1, workers=workers)
+    else:
+        # Analytic spectrum from the one-sided one; an extra zero bin stands for the negative frequencies
+        Zf = np.zeros(Z.shape[:-1] + (T // 2 + 2,), dtype=np.complex128)
+        Zf[..., :-1] = rfft(Z, axis=-1, workers=workers)
+        Zf[..., :-1] *= analytic_weights(T)
+
+    # Output bins in FFT order: the (M + 1) // 2 lowest positive and M // 2 negative frequencies
+    pos = np.r_[0:(M + 1) // 2, T - M // 2:T]
+    Zslow = np.empty((fc.size,) + Z.shape[:-1] + (M,), dtype=np.complex128)
+    for i, f in enumerate(fc):
+        idx = (pos + int(f) - 1) % T
+        if not is_analytic:
+            idx[idx > T // 2] = T // 2 + 1
+        Zs = Zf[..., idx]
+        if M != T:
+            Zs *= M / T
+        Zslow[i] = ifft(Zs, axis=-1, workers=workers, overwrite_x=True)
+
+    if not is_analytic:
+        Zslow = np.ascontiguousarray(Zslow.real)
+
+    return Zslow[0] if scalar else Zslow
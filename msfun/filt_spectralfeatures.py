@@ -0,0 +1,131 @@
+import numpy as np
+from .filt_applyfilter import filt_map
+
+default_quantiles = {'center': 0.5, 'min': 1e-2, 'max': 1 - 1e-2}
+
+def msfun_filt_spectralfeatures(P, freq, cfg=None):
+    """
+    Spectral features of a batch of power spectra, computed in one pass over the spectra.
+
+    Quantile frequencies are the bins whose cumulative normalized power is closest to each
+    quantile, the first one on ties (as np.argmin in the band_par of
+    msfun_filt_computespectrum), found with vectorized binary searches of the cumulative
+    spectrum; band powers are differences of that cumulative spectrum. Spectra are processed
+    in row blocks, so the only temporaries are block-sized.
+
+    Parameters:
+    - P: power spectra (..., F), e.g. (C, F) or (K, C, F)
+    - freq: frequency vector (F,), increasing
+    - cfg: (optional) dict with keys:
+        - quantiles: dict {name: q} [default center 0.5, min 1e-2, max 1 - 1e-2]
+        - bands: dict {name: [fmin, fmax]} of band-power ranges, fmin <= f < fmax
+          [default the bands of filt_map]
+        - peak_range: [fmin, fmax] searched for the peak frequency [default whole spectrum]
+        - block_bytes: memory budget of one block temporary [default 16 MB]
+
+    Returns:
+    - feat: dict of (...)-shaped arrays with keys
+        - 'f<name>', 'nu<name>': bin index and frequency of each quantile
+        - 'power': total power
+        - 'bandpower', 'bandrel': dicts {band: absolute / relative power}
+        - 'fpeak', 'nupeak': bin index and frequency of the spectral peak
+    """
+    if cfg is None:
+        cfg = {}
+
+    if not isinstance(P, np.ndarray) or P.ndim < 1:
+        raise TypeError("P must be a numeric array")
+
+    freq = np.asarray(freq)
+    if freq.ndim != 1 or freq.shape[0] != P.shape[-1]:
+        raise ValueError("freq must be a vector matching the last axis of P")
+
+    quantiles = cfg.get('quantiles', default_quantiles)
+    if not isinstance(quantiles, dict) or not all(0 <= q <= 1 for q in quantiles.values()):
+        raise ValueError("cfg.quantiles must be a dict of values in [0, 1]")
+
+    bands = cfg.get('bands')
+    if bands is None:
+        bands = {name: filt['freq'] for name, filt in filt_map.items() if filt is not None}
+    if not isinstance(bands, dict) or not all(len(b) == 2 and b[0] <= b[1] for b in bands.values()):
+        raise ValueError("cfg.bands must be a dict of [fmin, fmax] ranges")
+
+    F = freq.shape[0]
+    peak_range = cfg.get('peak_range')
+    p0, p1 = (0, F) if peak_range is None else np.searchsorted(freq, peak_range, side='left')
+    if p1 <= p0:
+        raise ValueError("cfg.peak_range contains no frequency bin")
+
+    # Band edges become bin ranges once: band power is cum[hi - 1] - cum[lo - 1]
+    edges = {name: np.searchsorted(freq, b, side='left') for name, b in bands.items()}
+
+    shape = P.shape[:-1]
+    rows = P.reshape(-1, F)
+    R = rows.shape[0]
+    qnames = list(quantiles)
+    qvals = np.array([quantiles[n] for n in qnames], dtype=float)
+
+    qind = np.empty((len(qnames), R), dtype=int)
+    power = np.empty(R)
+    bandpower = {name: np.empty(R) for name in bands}
+    fpeak = np.empty(R, dtype=int)
+
+    b = max(1, cfg.get('block_bytes', 2 ** 24) // (8 * F))
+    for r0 in range(0, R, b):
+        block = rows[r0:r0 + b]
+        cum = np.cumsum(block, axis=-1, dtype=float)
+        total = cum[:, -1].copy()
+        power[r0:r0 + b] = total
+        for name, (lo, hi) in edges.items():
+            bandpower[name][r0:r0 + b] = _cum_at(cum, hi) - _cum_at(cum, lo)
+        fpeak[r0:r0 + b] = p0 + np.argmax(block[:, p0:p1], axis=-1)
+
+        # Normalize in place: each row of cum rises from its first value to exactly 1
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cum /= total[:, np.newaxis]
+        empty = ~(total > 0)
+        cum[empty] = 0
+        qind[:, r0:r0 + b] = _nearest(cum, qvals)
+        qind[:, r0:r0 + b][:, empty] = 0
+
+    feat = {}
+    for n, ind in zip(qnames, qind):
+        feat['f' + n] = ind.reshape(shape)
+        feat['nu' + n] = freq[ind].reshape(shape)
+    feat['power'] = power.reshape(shape)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        feat['bandpower'] = {n: v.reshape(shape) for n, v in bandpower.items()}
+        feat['bandrel'] = {n: (v / power).reshape(shape) for n, v in bandpower.items()}
+    feat['fpeak'] = fpeak.reshape(shape)
+    feat['nupeak'] = freq[fpeak].reshape(shape)
+    return feat
+
+def _cum_at(cum, i):
+    return cum[:, i - 1] if i > 0 else np.zeros(cum.shape[0])
+
+def _nearest(cum, qvals):
+    # np.argmin(np.abs(cum - q), axis=-1) for each quantile q and nondecreasing row of cum,
+    # in O(log F) per row: |cum - q| falls then rises along a row, so its first minimum is
+    # the first bin with cum - q >= -d, d being the smaller distance of the two bins around q
+    F = cum.shape[1]
+    q = qvals[:, np.newaxis]
+    rows = np.arange(cum.shape[0])[np.newaxis, :]
+    hi = np.minimum(_first(cum, lambda c: c >= q, len(qvals)), F - 1)
+    lo = np.maximum(hi - 1, 0)
+    d = np.minimum(np.abs(cum[rows, lo] - q), np.abs(cum[rows, hi] - q))
+    return _first(cum, lambda c: c - q >= -d, len(qvals))
+
+def _first(cum, pred, nq):
+    # First bin of each row where the monotonic pred(values) holds (F if none), for nq predicates
+    n, F = cum.shape
+    rows = np.arange(n)[np.newaxis, :]
+    lo = np.zeros((nq, n), dtype=int)
+    hi = np.full((nq, n), F)
+    while True:
+        active = lo < hi
+        if not active.any():
+            return lo
+        mid = (lo + hi) // 2
+        ok = pred(cum[rows, np.minimum(mid, F - 1)])
+        hi = np.where(active & ok, mid, hi)
+        lo = np.where(active & ~ok, mid + 1, lo)
@@ -0,0 +1,139 @@
+import numpy as np
+from scipy.fft import rfft, irfft, ifft, next_fast_len
+from warnings import warn
+from .filt_preparecosine import msfun_filt_preparecosine
+from .filt_applyfilter import resolve_filt
+from .filt_getanalytic import analytic_weights
+from .filt_fftbackend import fft_workers
+
+def msfun_filt_streamfilter(chunks, cfg):
+    """
+    Applies a spectral cosine filter to a stream of time chunks using overlap-add.
+
+    The cosine-tapered frequency response is sampled on an ntaps-long grid and turned
+    into a zero-phase (centered) FIR filter, so memory and throughput only depend on
+    ntaps and blocksize, never on the total recording length.
+
+    Parameters:
+    - chunks: iterable of (C, n) arrays (any n), or a (C, T) array / np.memmap
+    - cfg: dict with keys:
+        - sfreq: sampling rate (Hz)
+        - filt: band name (key of filt_map) or filter dict
+        - ntaps: (optional) odd FIR length [default ~8 samples per narrowest transition]
+        - blocksize: (optional) number of samples filtered per FFT block
+
+    Returns:
+    - generator yielding filtered (C, blocksize) chunks (last one shorter); the
+      concatenated output has the same length as the concatenated input
+    """
+    if chunks is None or cfg is None:
+        raise ValueError("sig_filter_stream requires both signal chunks and config")
+
+    if not isinstance(cfg, dict) or 'sfreq' not in cfg or 'filt' not in cfg:
+        raise ValueError("cfg must contain 'sfreq' and 'filt' fields")
+
+    sfreq = cfg['sfreq']
+    filt = resolve_filt(cfg['filt'])
+    if filt is None:
+        raise ValueError("sig_filter_stream requires a filter, not 'none'")
+    cfg['filt'] = filt
+
+    if filt['win'] != 'boxcar':
+        warn("sig_filter_stream - Time-domain window ignored: a stream has no finite extent to taper.")
+
+    ntaps = fir_ntaps(filt, sfreq, cfg.get('ntaps'))
+    cfg['ntaps'] = ntaps
+
+    blocksize = cfg.get('blocksize', max(4 * ntaps, 2 ** 14))
+    if not isinstance(blocksize, (int, np.integer)) or blocksize <= 0:
+        raise ValueError("cfg.blocksize must be a positive integer")
+    cfg['blocksize'] = int(blocksize)
+
+    if isinstance(chunks, np.ndarray):
+        if chunks.ndim != 2:
+            raise ValueError("Array input must be 2D (chan x time)")
+        sig = chunks
+        chunks = (sig[:, t:t + blocksize] for t in range(0, sig.shape[1], blocksize))
+
+    h = cosine_fir(filt, ntaps, sfreq)
+    return _overlap_add(iter(chunks), h, int(blocksize), fft_workers(cfg))
+
+def fir_ntaps(filt, sfreq, ntaps=None):
+    """
+    Validated odd FIR length [default ~8 samples per narrowest transition of filt].
+    """
+    if ntaps is None:
+        ntaps = 2 * int(np.ceil(4 * sfreq / min(filt['width']))) + 1
+    if not isinstance(ntaps, (int, np.integer)) or ntaps < 3 or ntaps % 2 == 0:
+        raise ValueError("cfg.ntaps must be an odd integer >= 3")
+    return int(ntaps)
+
+def cosine_fir(filt, ntaps, sfreq, analytic=False):
+    """
+    Zero-phase FIR of the cosine filter: circular impulse response of the ntaps-point mask,
+    centered at ntaps // 2. With analytic=True, the complex FIR whose output is the analytic
+    signal of the band-passed input.
+    """
+    _, F = msfun_filt_preparecosine(filt, ntaps, sfreq, onesided=True, cache=True)
+    if not analytic:
+        return np.roll(irfft(F, n=ntaps), ntaps // 2)
+    H = np.zeros(ntaps, dtype=np.complex128)
+    H[:ntaps // 2 + 1] = F * analytic_weights(ntaps)
+    return np.roll(ifft(H), ntaps // 2)
+
+def _overlap_add(chunks, h, B, workers=None):
+    ntaps = h.shape[0]
+    delay = ntaps // 2
+    nfft = next_fast_len(B + ntaps - 1, real=True)
+    H = rfft(h, n=nfft)
+
+    buf = None     # pending input samples (C, < B)
+    tail = None    # convolution tail carried to the next block (C, ntaps - 1)
+    skip = delay   # leading output samples still to drop (group delay)
+    n_in = 0
+    n_out = 0
+
+    def block(x):
+        nonlocal tail
+        Fx = rfft(x, n=nfft, axis=-1, workers=workers)
+        Fx *= H
+        y = irfft(Fx, n=nfft, axis=-1, workers=workers, overwrite_x=True)[:, :x.shape[1] + ntaps - 1]
+        if tail is None:
+            tail = np.zeros((x.shape[0], ntaps - 1))
+        y[:, :ntaps - 1] += tail
+        tail = y[:, x.shape[1]:].copy()
+        return y[:, :x.shape[1]]
+
+    def emit(y):
+        nonlocal skip, n_out
+        if skip:
+            drop = min(skip, y.shape[1])
+            y = y[:, drop:]
+            skip -= drop
+        y = y[:, :n_in - n_out]
+        n_out += y.shape[1]
+        return y
+
+    for chunk in chunks:
+        chunk = np.asarray(chunk, dtype=float)
+        if chunk.ndim != 2:
+            raise ValueError("Each chunk must be 2D (chan x time)")
+        n_in += chunk.shape[1]
+        buf = chunk if buf is None else np.concatenate((buf, chunk), axis=1)
+        while buf.shape[1] >= B:
+            y = emit(block(buf[:, :B]))
+            buf = buf[:, B:]
+            if y.shape[1]:
+                yield y
+
+    if not n_in:
+        return
+
+    # Flush the pending samples, then the filter tail (zero-padded end of stream)
+    if buf.shape[1]:
+        y = np.concatenate((block(buf), tail), axis=1)
+    else:
+        y = tail
+    y = emit(y)
+    if y.shape[1]:
+        yield y
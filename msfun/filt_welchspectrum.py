@@ -0,0 +1,163 @@
+import numpy as np
+import scipy.fft
+from numpy.lib.stride_tricks import sliding_window_view
+from .sig_spectrum import spectrum_band_par
+from .filt_fftbackend import fft_workers
+from .filt_precision import float_dtype, cast_dtype
+
+def msfun_filt_welchspectrum(sig, cfg):
+    """
+    Streaming Welch / multitaper power spectrum of a 2D or 3D signal, or of a stream of chunks.
+
+    The signal is cut into (overlapping) nfft-long segments, each tapered and transformed;
+    the power of every segment is folded into a running mean and variance, so memory is
+    O(C x nfft) whatever the recording length. Tapers are scaled to nfft energy: with a
+    'boxcar' taper, nfft = T and no overlap, the result equals the epoch-averaged power of
+    msfun_filt_computespectrum.
+
+    Parameters:
+    - sig: np.ndarray (C, T) or (K, C, T), or iterable of (C, n) chunks (any n)
+    - cfg: dict with keys:
+        - sfreq: sampling frequency (Hz)
+        - nfft: segment length in samples [default 2 * sfreq]
+        - overlap: fraction of overlap between segments, in [0, 1) [default 0.5]
+        - taper: scipy window name, or 'dpss' for multitaper [default 'hann']
+        - nw: (dpss) time-halfbandwidth product [default 4]
+        - ntapers: (dpss) number of tapers [default 2 * nw - 1]
+        - average: (only for epoched data) pool all epochs [default True]
+        - return_band_par: also return the msfun_filt_computespectrum spectrum characteristics
+        - dtype: (optional) 'float32' or 'float64' working precision, see msfun_filt_precision
+
+    Returns:
+    - P: mean power spectrum (C, nfft // 2), or (K, C, nfft // 2) per epoch when not averaged
+    - freq: corresponding frequency vector
+    - band_par: (optional) dictionary of spectrum characteristics
+    cfg['var'] holds the variance of the segment powers (same shape as P) and cfg['nseg']
+    the number of segments pooled.
+    """
+
+    if sig is None or cfg is None:
+        raise ValueError("msfun_filt_welchspectrum requires both signal and configuration")
+
+    if not isinstance(cfg, dict) or 'sfreq' not in cfg:
+        raise ValueError("cfg must include key 'sfreq'")
+
+    sfreq = cfg['sfreq']
+    if not isinstance(sfreq, (int, float)) or sfreq <= 0:
+        raise ValueError("Sampling frequency must be a positive scalar")
+
+    if isinstance(sig, np.ndarray) and sig.ndim not in [2, 3]:
+        raise ValueError("Signal must be 2D or 3D")
+
+    nfft = cfg.get('nfft', int(round(2 * sfreq)))
+    if not isinstance(nfft, (int, np.integer)) or nfft < 2:
+        raise ValueError("cfg.nfft must be an integer >= 2")
+    if isinstance(sig, np.ndarray) and nfft > sig.shape[-1]:
+        raise ValueError("cfg.nfft longer than the signal")
+    nfft = int(nfft)
+
+    overlap = cfg.get('overlap', 0.5)
+    if not isinstance(overlap, (int, float)) or not 0 <= overlap < 1:
+        raise ValueError("cfg.overlap must be in [0, 1)")
+    step = max(1, nfft - int(round(overlap * nfft)))
+
+    dtype = float_dtype(cfg)
+    tapers = welch_tapers(nfft, cfg.get('taper', 'hann'), cfg.get('nw', 4), cfg.get('ntapers'))
+    tapers = tapers.astype(dtype or tapers.dtype, copy=False)
+    workers = fft_workers(cfg)
+
+    if isinstance(sig, np.ndarray):
+        epochs = sig[np.newaxis] if sig.ndim == 2 else sig
+        average = sig.ndim == 2 or bool(cfg.get('average', True))
+        moments = [_Moments()] if average else [_Moments() for _ in epochs]
+        for k, epoch in enumerate(epochs):
+            windows = sliding_window_view(epoch, nfft, axis=-1)[:, ::step, :]
+            _accumulate(moments[0 if average else k], windows, tapers, workers, dtype)
+    else:
+        moments = [_Moments()]
+        _stream(moments[0], iter(sig), nfft, step, tapers, workers, dtype)
+
+    if not moments[0].n:
+        raise ValueError("Signal shorter than one segment")
+
+    P = np.stack([m.mean for m in moments]) if len(moments) > 1 else moments[0].mean
+    cfg['var'] = np.stack([m.var() for m in moments]) if len(moments) > 1 else moments[0].var()
+    cfg['nseg'] = moments[0].n
+    freq = (np.arange(nfft) * sfreq / nfft)[:nfft // 2]
+
+    if 'return_band_par' in cfg and cfg['return_band_par']:
+        return P, freq, spectrum_band_par(P, freq)
+
+    return P, freq
+
+def welch_tapers(nfft, taper='hann', nw=4, ntapers=None):
+    """
+    (ntapers, nfft) taper array, each taper scaled to an energy of nfft.
+    """
+    from scipy.signal import get_window
+    from scipy.signal.windows import dpss
+    if isinstance(taper, str) and taper.lower() == 'dpss':
+        if ntapers is None:
+            ntapers = max(1, int(2 * nw) - 1)
+        w = np.atleast_2d(dpss(nfft, nw, Kmax=ntapers))
+    else:
+        w = get_window(taper, nfft, fftbins=True)[np.newaxis, :]
+    return w * np.sqrt(nfft / np.sum(w ** 2, axis=-1, keepdims=True))
+
+class _Moments:
+    # Running mean and sum of squared deviations, merged batch by batch (Chan et al.)
+    def __init__(self):
+        self.n = 0
+        self.mean = None
+        self.m2 = None
+
+    def update(self, P):
+        # P: (C, nseg, nfreq) segment powers
+        nb = P.shape[1]
+        mean_b = P.mean(axis=1)
+        m2_b = np.sum((P - mean_b[:, np.newaxis, :]) ** 2, axis=1)
+        if not self.n:
+            self.n, self.mean, self.m2 = nb, mean_b, m2_b
+            return
+        n = self.n + nb
+        delta = mean_b - self.mean
+        self.mean += delta * (nb / n)
+        self.m2 += m2_b + delta ** 2 * (self.n * nb / n)
+        self.n = n
+
+    def var(self):
+        if self.n < 2:
+            return np.full_like(self.mean, np.nan)
+        return self.m2 / (self.n - 1)
+
+def _segment_power(windows, tapers, workers, dtype=None):
+    nfft = tapers.shape[-1]
+    P = 0
+    for w in tapers:
+        x = np.multiply(windows, w, dtype=cast_dtype(windows, dtype))
+        if np.isrealobj(windows):
+            X = scipy.fft.rfft(x, axis=-1, workers=workers, overwrite_x=True)
+        else:
+            X = scipy.fft.fft(x, axis=-1, workers=workers, overwrite_x=True)
+        P = P + np.abs(X[..., :nfft // 2]) ** 2
+    return P / tapers.shape[0]
+
+def _accumulate(moments, windows, tapers, workers, dtype=None, budget=2 ** 22):
+    # windows: (C, nseg, nfft) strided view; transformed a bounded batch of segments at a time
+    C, nseg, nfft = windows.shape
+    b = max(1, budget // (C * nfft))
+    for s in range(0, nseg, b):
+        moments.update(_segment_power(windows[:, s:s + b, :], tapers, workers, dtype))
+
+def _stream(moments, chunks, nfft, step, tapers, workers, dtype=None):
+    buf = None
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        if chunk.ndim != 2:
+            raise ValueError("Each chunk must be 2D (chan x time)")
+        buf = chunk if buf is None else np.concatenate((buf, chunk), axis=1)
+        if buf.shape[1] >= nfft:
+            nseg = (buf.shape[1] - nfft) // step + 1
+            _accumulate(moments, sliding_window_view(buf, nfft, axis=-1)[:, ::step, :][:, :nseg],
+                        tapers, workers, dtype)
+            buf = buf[:, nseg * step:]
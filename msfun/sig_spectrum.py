@@ -0,0 +1,87 @@
+import numpy as np
+import scipy.fft
+from warnings import warn
+from .filt_fftbackend import fft_workers
+from .filt_precision import float_dtype, as_float
+from .filt_spectralfeatures import msfun_filt_spectralfeatures, default_quantiles
+
+def msfun_filt_computespectrum(sig, cfg):
+    """
+    Compute FFT-based spectrum of a 2D or 3D time series signal.
+
+    Parameters:
+    - sig: np.ndarray, shape (C, T) or (K, C, T)
+    - cfg: dict with keys:
+        - 'sfreq': sampling frequency (Hz)
+        - 'type': 'power' or 'fourier' [default 'power']
+        - 'average': (only for epoched data) whether to average across epochs
+        - 'dtype': (optional) 'float32' or 'float64' working precision, see msfun_filt_precision
+
+    Returns:
+    - Ssig: spectral coefficients or power spectrum
+    - freq: corresponding frequency vector
+    - band_par: (optional) dictionary of spectrum characteristics
+    """
+
+    if sig is None or cfg is None:
+        raise ValueError("msfun_filt_computespectrum requires both signal and configuration")
+
+    if not isinstance(sig, np.ndarray):
+        raise TypeError("Signal must be a numeric array")
+
+    if sig.ndim not in [2, 3]:
+        raise ValueError("Signal must be 2D or 3D")
+
+    if not isinstance(cfg, dict) or 'sfreq' not in cfg:
+        raise ValueError("cfg must include key 'sfreq'")
+
+    sfreq = cfg['sfreq']
+    if not isinstance(sfreq, (int, float)) or sfreq <= 0:
+        raise ValueError("Sampling frequency must be a positive scalar")
+
+    cfg_type = cfg.get('type', 'power').lower()
+    if cfg_type not in ['power', 'fourier']:
+        raise ValueError("cfg['type'] must be 'power' or 'fourier'")
+
+    average = bool(cfg.get('average', False)) if sig.ndim == 3 else False
+    sig = as_float(sig, float_dtype(cfg))
+
+    # Setup frequency vector
+    T = sig.shape[-1]
+    freq = np.arange(T) * sfreq / T
+
+    # Perform FFT (only the non-negative half for real input)
+    half = T // 2
+    if np.isrealobj(sig):
+        Ssig = scipy.fft.rfft(sig, axis=-1, workers=fft_workers(cfg))
+    else:
+        Ssig = scipy.fft.fft(sig, axis=-1, workers=fft_workers(cfg))
+
+    # Truncate upper half
+    freq = freq[:half]
+    Ssig = Ssig[..., :half]
+
+    # Power spectrum
+    if cfg_type == 'power':
+        Ssig = np.abs(Ssig) ** 2
+
+    # Epoch averaging
+    if average:
+        if cfg_type == 'fourier':
+            warn("msfun_filt_computespectrum - Averaging Fourier coefficients is unusual...")
+        Ssig = np.mean(Ssig, axis=0)
+
+    # Spectral summary
+    if 'return_band_par' in cfg and cfg['return_band_par']:
+        P = np.abs(Ssig) ** 2 if cfg_type == 'fourier' else Ssig
+        return Ssig, freq, spectrum_band_par(P, freq)
+
+    return Ssig, freq
+
+def spectrum_band_par(P, freq):
+    """
+    Spectrum characteristics: frequency indices (fcenter, fmin, fmax) and values (nucenter,
+    numin, numax) at which the cumulative normalized power reaches 0.5, 1e-2 and 1 - 1e-2.
+    """
+    feat = msfun_filt_spectralfeatures(P, freq, {'quantiles': default_quantiles, 'bands': {}})
+    return {k: feat[k] for k in ['fcenter', 'nucenter', 'fmin', 'numin', 'fmax', 'numax']}
@@ -0,0 +1,48 @@
+import json
+import os
+import numpy as np
+import pytest
+
+class FakeRaw:
+    """
+    Minimal stand-in for an mne Raw object, as used by msfun_filt_preprocfiff.
+    """
+
+    def __init__(self, data, sfreq, first_samp=0):
+        self._data = data
+        self.info = {'sfreq': sfreq, 'ch_names': [f'E{i + 1}' for i in range(data.shape[0])]}
+        self.first_samp = first_samp
+        self.n_times = data.shape[1]
+
+    def __getitem__(self, key):
+        picks, samples = key
+        return self._data[picks, samples], None
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+@pytest.fixture
+def mff_recording(tmp_path):
+    """
+    Factory of stand-in .mff bundles whose decoded-sample cache is already populated.
+    Returns (mff_file, cache_dir, ch_names) for a (C, N) data array, written as <name>.mff.
+    """
+    from msfun.filt_preprocmff import mff_cache_files, _mff_signature
+
+    def make(data, sfreq, name='rec'):
+        names = [f'E{i + 1}' for i in range(data.shape[0])]
+        mff = str(tmp_path / (name + '.mff'))
+        cache_dir = str(tmp_path / 'mff_cache')
+        os.makedirs(mff, exist_ok=True)
+        with open(os.path.join(mff, 'info.xml'), 'w') as fid:
+            fid.write('<fileInfo/>')
+        os.makedirs(cache_dir, exist_ok=True)
+        npy_file, meta_file = mff_cache_files(mff, cache_dir)
+        np.save(npy_file, np.asarray(data, dtype=np.float64))
+        with open(meta_file, 'w') as fid:
+            json.dump({'mff_file': os.path.abspath(mff), 'signature': _mff_signature(os.path.abspath(mff)),
+                       'ch_names': names, 'sfreq': float(sfreq)}, fid)
+        return mff, cache_dir, names
+
+    return make
@@ -0,0 +1,16 @@
+import numpy as np
+import pytest
+from scipy.signal import hilbert
+from msfun import msfun_filt_getanalytic
+
+@pytest.mark.parametrize('T', [500, 501])
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_getanalytic_matches_hilbert(rng, T, dtype):
+    x = rng.standard_normal((3, T)).astype(dtype)
+    Z = msfun_filt_getanalytic(x)
+    assert Z.dtype == np.complex128
+    np.testing.assert_allclose(Z, hilbert(x.astype(np.float64), axis=-1), rtol=0, atol=1e-12)
+
+def test_getanalytic_dim(rng):
+    x = rng.standard_normal((64, 3))
+    np.testing.assert_allclose(msfun_filt_getanalytic(x, dim=0), hilbert(x, axis=0), rtol=0, atol=1e-12)
@@ -0,0 +1,43 @@
+import os
+import numpy as np
+from msfun import msfun_filt_batch, msfun_filt_preprocmff, msfun_filt_computespectrum, batch_output
+
+sfreq = 256.
+
+def make_batch(rng, mff_recording, tmp_path):
+    files = []
+    for name in ['a', 'b', 'c']:
+        mff, cache_dir, names = mff_recording(rng.standard_normal((3, 4000)), sfreq, name)
+        files.append(mff)
+    times = (np.arange(3)[:, None] * 1000 + np.arange(512)) / sfreq
+    cfg = {'out_dir': str(tmp_path / 'out'), 'times': times, 'sfreq': sfreq, 'workers': 2,
+           'preproc': {'chans': names, 'cache_dir': cache_dir, 'filter': False},
+           'spectrum': {'type': 'power'}}
+    return files, cfg
+
+def test_outputs_and_resume(rng, mff_recording, tmp_path):
+    files, cfg = make_batch(rng, mff_recording, tmp_path)
+    status = msfun_filt_batch(files, dict(cfg))
+    assert sorted(s['status'] for s in status) == ['done'] * 3
+    # Atomic writes: only the final .npz files are left in the output directory
+    assert sorted(os.listdir(cfg['out_dir'])) == ['a.npz', 'b.npz', 'c.npz']
+
+    sig, _ = msfun_filt_preprocmff(cfg['times'], sfreq, dict(cfg['preproc'], mff_file=files[1]))
+    spec, freq = msfun_filt_computespectrum(sig, {'sfreq': sfreq, 'type': 'power'})
+    with np.load(batch_output(files[1], cfg['out_dir'])) as out:
+        np.testing.assert_array_equal(out['sig'], sig)
+        np.testing.assert_array_equal(out['spec'], spec)
+        np.testing.assert_array_equal(out['freq'], freq)
+
+    again = msfun_filt_batch(files, dict(cfg))
+    assert [s['status'] for s in again] == ['skipped'] * 3
+
+def test_failure_is_reported_and_others_finish(rng, mff_recording, tmp_path):
+    files, cfg = make_batch(rng, mff_recording, tmp_path)
+    bad = {files[1]: np.arange(0, 5000, 10) / sfreq}  # spans more than the 4000-sample recording
+    times = {f: bad.get(f, cfg['times']) for f in files}
+    status = {s['file']: s for s in msfun_filt_batch(files, dict(cfg, times=times))}
+    assert status[files[1]]['status'] == 'failed'
+    assert 'outside the recording' in status[files[1]]['error']
+    assert status[files[0]]['status'] == status[files[2]]['status'] == 'done'
+    assert sorted(os.listdir(cfg['out_dir'])) == ['a.npz', 'c.npz']
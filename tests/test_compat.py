@@ -0,0 +1,17 @@
+import importlib
+import sys
+import pytest
+import msfun
+
+moved = ['filt_applyfilter', 'filt_concatenate', 'filt_downsample', 'filt_getanalytic', 'filt_orthogonalize',
+         'filt_preparecosine', 'filt_preprocfiff', 'filt_preprocmff', 'filt_removeleakage',
+         'filt_slowmodulation', 'sig_spectrum']
+
+@pytest.mark.parametrize('name', moved)
+def test_old_module_reexports_package(name):
+    sys.modules.pop('msfun_' + name, None)
+    with pytest.warns(DeprecationWarning):
+        old = importlib.import_module('msfun_' + name)
+    new = importlib.import_module('msfun.' + name)
+    public = msfun._exports[name]
+    assert public and all(getattr(old, k) is getattr(new, k) for k in public)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from msfun import msfun_sig_concat_epoch
+
+def sliced(sig, L, step):
+    starts = range(0, sig.shape[1] - L + 1, step)
+    return np.stack([sig[:, s:s + L] for s in starts])
+
+@pytest.mark.parametrize('L, kwargs, step', [(100, {}, 100), (100, {'step': 30}, 30), (100, {'step': 250}, 250),
+                                             (100, {'overlap': 75}, 25), (100, {'overlap': 0}, 100), (1000, {}, 1000)])
+def test_sliding_matches_slicing(rng, L, kwargs, step):
+    sig = rng.standard_normal((3, 1000))
+    out = msfun_sig_concat_epoch(sig, L, 'sliding', **kwargs)
+    np.testing.assert_array_equal(out, sliced(sig, L, step))
+
+def test_sliding_is_read_only_view(rng):
+    sig = rng.standard_normal((3, 1000))
+    out = msfun_sig_concat_epoch(sig, 100, 'sliding', overlap=50)
+    assert np.shares_memory(out, sig)
+    assert not out.flags.writeable
+    with pytest.raises(ValueError):
+        out[0, 0, 0] = 1.
+    sig[1, 60] = 7.  # the view follows its buffer
+    assert out[0, 1, 60] == out[1, 1, 10] == 7.
+
+def test_sliding_invalid():
+    sig = np.zeros((2, 100))
+    with pytest.raises(ValueError):
+        msfun_sig_concat_epoch(sig, 10, 'sliding', step=5, overlap=5)
+    with pytest.raises(ValueError):
+        msfun_sig_concat_epoch(sig, 10, 'sliding', overlap=10)
+    with pytest.raises(ValueError):
+        msfun_sig_concat_epoch(sig, 200, 'sliding')
+    with pytest.raises(ValueError):
+        msfun_sig_concat_epoch(np.zeros((2, 2, 100)), 10, 'sliding')
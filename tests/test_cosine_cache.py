@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from msfun import filt_map, msfun_filt_preparecosine, CosineFilterCache, cosine_cache
+
+filt = dict(filt_map['alpha'], win='hann')
+
+def test_hit_returns_same_arrays():
+    cache = CosineFilterCache()
+    win, F = cache.get(filt, 500, 256.)
+    again = cache.get(dict(filt, freq=list(filt['freq'])), 500, 256.)
+    assert again[0] is win and again[1] is F
+    assert cache.info() == {'hits': 1, 'misses': 1, 'maxsize': 32, 'currsize': 1}
+    ref_win, ref_F = msfun_filt_preparecosine(filt, 500, 256.)
+    np.testing.assert_array_equal(win, ref_win)
+    np.testing.assert_array_equal(F, ref_F)
+
+@pytest.mark.parametrize('opt, args', [({}, (501, 256., False)), ({}, (500, 250., False)),
+                                       ({}, (500, 256., True)), ({'win': 'boxcar'}, (500, 256., False)),
+                                       ({'width': [2, 2]}, (500, 256., False))])
+def test_changed_parameter_misses(opt, args):
+    cache = CosineFilterCache()
+    cache.get(filt, 500, 256., False)
+    cache.get(dict(filt, **opt), *args)
+    assert cache.info()['misses'] == 2 and cache.info()['currsize'] == 2
+
+def test_clear():
+    cache = CosineFilterCache()
+    cache.get(filt, 500, 256.)
+    cache.get(filt, 500, 256.)
+    cache.clear()
+    assert cache.info() == {'hits': 0, 'misses': 0, 'maxsize': 32, 'currsize': 0}
+    cache.get(filt, 500, 256.)
+    assert cache.info()['misses'] == 1
+
+def test_lru_eviction():
+    cache = CosineFilterCache(maxsize=2)
+    first = cache.get(filt, 100, 256.)
+    cache.get(filt, 200, 256.)
+    cache.get(filt, 100, 256.)   # refreshes 100: 200 is now the oldest
+    cache.get(filt, 300, 256.)
+    assert cache.info()['currsize'] == 2
+    assert cache.get(filt, 100, 256.)[0] is first[0]
+    misses = cache.info()['misses']
+    cache.get(filt, 200, 256.)
+    assert cache.info()['misses'] == misses + 1
+
+def test_cached_arrays_are_read_only():
+    win, F = msfun_filt_preparecosine(filt, 500, 256., cache=True)
+    assert cosine_cache.get(filt, 500, 256.)[0] is win
+    with pytest.raises(ValueError):
+        win[0] = 0
+    with pytest.raises(ValueError):
+        F[0] = 0
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from scipy.signal import resample
+from msfun import msfun_sig_filter
+
+sfreq = 256.
+
+def assert_close(a, b):
+    np.testing.assert_allclose(a, b, rtol=0, atol=1e-12 * np.max(np.abs(b)))
+
+@pytest.mark.parametrize('T, M', [(1000, 250), (1004, 251), (1001, 250), (1003, 251)])
+@pytest.mark.parametrize('filt', ['alpha', 'none'])
+@pytest.mark.parametrize('epochs', [False, True])
+def test_decimation_matches_resample(rng, T, M, filt, epochs):
+    sig = rng.standard_normal((3, 4, T) if epochs else (4, T))
+    cfg = {'sfreq': sfreq, 'filt': filt, 'downsfreq': 64.}
+    out = msfun_sig_filter(sig, cfg)
+    full = sig if filt == 'none' else msfun_sig_filter(sig, {'sfreq': sfreq, 'filt': filt})
+    assert out.shape == sig.shape[:-1] + (M,)
+    assert_close(out, resample(full, M, axis=-1))
+    np.testing.assert_array_equal(cfg['tsamp'], np.round(np.arange(M) * T / M).astype(int))
+    assert cfg['downsfreq'] == sfreq * M / T
+
+def test_complex_input_uses_real_part(rng):
+    sig = rng.standard_normal((2, 1000)) + 1j * rng.standard_normal((2, 1000))
+    out = msfun_sig_filter(sig, {'sfreq': sfreq, 'filt': 'alpha', 'downsfreq': 64.})
+    assert np.isrealobj(out)
+    assert_close(out, resample(msfun_sig_filter(sig, {'sfreq': sfreq, 'filt': 'alpha'}), 250, axis=-1))
+
+def test_invalid_downsfreq(rng):
+    with pytest.raises(ValueError):
+        msfun_sig_filter(rng.standard_normal((2, 100)), {'sfreq': sfreq, 'filt': 'alpha', 'downsfreq': 300.})
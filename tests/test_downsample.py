@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from msfun import msfun_filt_downsample
+
+def tile_mean_downsample(sig, sfreq, downsfreq, smooth=True, overlap=1):
+    # Reference: the original implementation, gathering every buffer with tiled indices
+    T = sig.shape[-1]
+    N = int(round(sfreq / downsfreq))
+    if overlap >= N:
+        overlap = 1
+    step = N // overlap
+    nsamp = (T - N) // step + 1
+    tsamp = np.round(N / 2).astype(int) + np.arange(0, nsamp * step, step)
+    if sig.ndim == 3:
+        K, C = sig.shape[:2]
+        sigbis = sig.transpose(2, 0, 1).reshape(T, K * C).T
+    else:
+        sigbis = sig
+    if not smooth:
+        sigbis = sigbis[:, tsamp]
+    else:
+        tbuf = np.arange(0, nsamp * step, step)
+        tbuf = np.tile(tbuf, (N, 1)) + np.tile(np.arange(N).reshape(-1, 1), (1, nsamp))
+        sigbuf = sigbis[:, tbuf.flatten()].reshape(sigbis.shape[0], N, nsamp)
+        sigbis = np.mean(sigbuf, axis=1)
+    if sig.ndim == 3:
+        sigbis = sigbis.T.reshape(nsamp, K, C).transpose(1, 2, 0)
+    return sigbis, tsamp
+
+@pytest.mark.parametrize('shape', [(4, 1001), (3, 4, 1001)])
+@pytest.mark.parametrize('dtype', [np.float64, np.float32, np.int16])
+@pytest.mark.parametrize('smooth, overlap', [(True, 1), (True, 2), (True, 3), (False, 1)])
+def test_matches_tile_mean(rng, shape, dtype, smooth, overlap):
+    sig = (rng.standard_normal(shape) * 100).astype(dtype)
+    out, tsamp = msfun_filt_downsample(sig, {'sfreq': 256., 'downsfreq': 32., 'smooth': smooth, 'overlap': overlap})
+    ref, ref_tsamp = tile_mean_downsample(sig, 256., 32., smooth, overlap)
+    assert out.dtype == ref.dtype
+    assert out.shape == ref.shape
+    np.testing.assert_array_equal(tsamp, ref_tsamp)
+    eps = 1e-6 if ref.dtype == np.float32 else 1e-12  # float32 means differ in summation order only
+    np.testing.assert_allclose(out, ref, rtol=0, atol=eps * np.max(np.abs(sig)))
+
+def test_chunked_means(rng):
+    sig = rng.standard_normal((2, 5000))
+    out, _ = msfun_filt_downsample(sig, {'sfreq': 256., 'downsfreq': 32., 'chunk': 40})
+    np.testing.assert_allclose(out, tile_mean_downsample(sig, 256., 32.)[0], rtol=0, atol=1e-12)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+import scipy.fft
+from msfun import msfun_filt_fftbackend, fft_workers, fft_overwrite, msfun_sig_filter
+import msfun.filt_applyfilter as applyfilter
+
+@pytest.fixture
+def fft_calls(monkeypatch):
+    # Record the keyword arguments of the FFT calls made by msfun_sig_filter
+    calls = []
+    for name in ['rfft', 'irfft', 'fft', 'ifft']:
+        def spy(*args, _f=getattr(scipy.fft, name), _name=name, **kwargs):
+            calls.append((_name, kwargs.get('workers'), kwargs.get('overwrite_x')))
+            return _f(*args, **kwargs)
+        monkeypatch.setattr(applyfilter, name, spy)
+    return calls
+
+def run_filter(x, **cfg):
+    return msfun_sig_filter(x, dict({'sfreq': 256., 'filt': 'alpha'}, **cfg))
+
+def test_context_passes_settings_to_fft_calls(rng, fft_calls):
+    x = rng.standard_normal((4, 500))
+    with msfun_filt_fftbackend(workers=3, overwrite_x=True):
+        out = run_filter(x.copy())
+    assert [c[0] for c in fft_calls] == ['rfft', 'irfft']
+    assert all(c[1:] == (3, True) for c in fft_calls)
+    fft_calls.clear()
+    np.testing.assert_allclose(run_filter(x), out, rtol=0, atol=1e-12)
+    assert all(c[1:] == (1, False) for c in fft_calls)
+
+def test_cfg_overrides_context(rng, fft_calls):
+    with msfun_filt_fftbackend(workers=3, overwrite_x=True):
+        run_filter(rng.standard_normal((4, 500)), fft_workers=2, fft_overwrite=False)
+    assert all(c[1:] == (2, False) for c in fft_calls)
+
+def test_settings_restored_on_exit():
+    assert (fft_workers(), fft_overwrite()) == (1, False)
+    with msfun_filt_fftbackend(workers=4, overwrite_x=True):
+        assert (fft_workers(), fft_overwrite()) == (4, True)
+        with msfun_filt_fftbackend(overwrite_x=False):
+            assert (fft_workers(), fft_overwrite()) == (4, False)
+        assert (fft_workers(), fft_overwrite()) == (4, True)
+    assert (fft_workers(), fft_overwrite()) == (1, False)
+
+    with pytest.raises(RuntimeError):
+        with msfun_filt_fftbackend(workers=2, overwrite_x=True):
+            raise RuntimeError
+    assert (fft_workers(), fft_overwrite()) == (1, False)
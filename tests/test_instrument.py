@@ -0,0 +1,49 @@
+import json
+import logging
+import time
+import numpy as np
+from msfun import msfun_filt_instrument, span, msfun_sig_filter
+
+def test_span_records_time_and_allocation(tmp_path):
+    with msfun_filt_instrument() as prof:
+        with span('outer') as outer:
+            with span('inner') as sp:
+                time.sleep(0.01)
+                sp.alloc(np.zeros(1000), np.zeros(10, dtype=np.float32))
+            outer.alloc(np.zeros(5))
+    inner, outer = prof.records
+    assert (inner['name'], inner['path'], outer['path']) == ('inner', 'outer/inner', 'outer')
+    assert inner['time'] >= 0.01 and outer['time'] >= inner['time']
+    assert (inner['bytes'], outer['bytes']) == (8040, 40)
+    assert prof.profile()['outer/inner'] == {'count': 1, 'time': inner['time'], 'bytes': 8040}
+
+    prof.to_json(str(tmp_path / 'prof.json'))
+    with open(tmp_path / 'prof.json') as fid:
+        assert json.load(fid)['records'][0]['path'] == 'outer/inner'
+
+def test_spans_are_noops_outside_a_block():
+    records = []
+    with msfun_filt_instrument(records.append):
+        pass
+    with span('stage') as sp:
+        sp.alloc(np.zeros(10))
+    assert records == []
+
+def test_functions_report_spans(rng):
+    sig = rng.standard_normal((4, 500))
+    with msfun_filt_instrument() as prof:
+        msfun_sig_filter(sig, {'sfreq': 256., 'filt': 'alpha'})
+    paths = prof.profile()
+    assert {'sig_filter', 'sig_filter/window', 'sig_filter/fft', 'sig_filter/ifft'} <= set(paths)
+    assert paths['sig_filter/window']['bytes'] == sig.nbytes
+
+def test_log_messages(rng, caplog):
+    sig = rng.standard_normal((4, 500))
+    with caplog.at_level(logging.WARNING, logger='msfun'):
+        msfun_sig_filter(sig, {'sfreq': 256., 'filt': 'alpha'})
+    assert not caplog.records
+    with caplog.at_level(logging.INFO, logger='msfun'):
+        msfun_sig_filter(sig, {'sfreq': 256., 'filt': 'alpha'})
+    messages = [r.getMessage() for r in caplog.records]
+    assert 'sig_filter - Filtering data...' in messages
+    assert all(r.name == 'msfun' for r in caplog.records)
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+from scipy.signal import fftconvolve
+from msfun import filt_map, msfun_filt_downsample
+from msfun.filt_online import OnlineProcessor, synthetic_stream
+from msfun.filt_streamfilter import fir_ntaps, cosine_fir
+from msfun.filt_removeleakage import OrthStatRegressor, orthstat_beta
+
+sfreq = 256.
+blocksize = 64
+nblocks = 40
+
+def stream(seed=0, nchan=4):
+    # Blocks are views of the ring slots: copy them before they are overwritten
+    return [b.copy() for b in synthetic_stream({'sfreq': sfreq, 'blocksize': blocksize,
+                                                'nblocks': nblocks, 'nchan': nchan, 'seed': seed})]
+
+def offline(x, analytic):
+    # Same zero-phase FIR applied to the whole recording at once, delay removed
+    filt = filt_map['alpha']
+    ntaps = fir_ntaps(filt, sfreq)
+    h = cosine_fir(filt, ntaps, sfreq, analytic=analytic)
+    y = fftconvolve(x, h[np.newaxis, :], axes=-1)
+    return y[:, ntaps // 2:ntaps // 2 + x.shape[1]]
+
+def run(cfg, blocks):
+    proc = OnlineProcessor(dict({'sfreq': sfreq, 'blocksize': blocksize, 'filt': 'alpha'}, **cfg))
+    outs = [proc.push(b) for b in blocks]
+    outs.append(proc.flush())
+    return proc, outs
+
+def assert_close(a, b):
+    np.testing.assert_allclose(a, b, rtol=0, atol=1e-12 * np.max(np.abs(b)))
+
+@pytest.mark.parametrize('analytic', [False, True])
+def test_push_flush_matches_offline_fir(analytic):
+    blocks = stream()
+    proc, outs = run({'analytic': analytic}, blocks)
+    out = np.concatenate(outs, axis=1)
+    assert np.iscomplexobj(out) == analytic
+    assert_close(out, offline(np.concatenate(blocks, axis=1), analytic))
+
+def test_fixed_delay():
+    blocks = stream()
+    proc, outs = run({}, blocks)
+    assert proc.delay == fir_ntaps(filt_map['alpha'], sfreq) // 2
+    assert proc.report()['delay_samples'] == proc.delay
+    # Once the start-up delay is absorbed, each push returns exactly one block
+    n = np.cumsum([o.shape[1] for o in outs[:-1]])
+    k = np.arange(1, nblocks + 1)
+    np.testing.assert_array_equal(n, np.maximum(k * blocksize - proc.delay, 0))
+    assert n[-1] + outs[-1].shape[1] == nblocks * blocksize
+
+def test_impulse_is_centered():
+    x = np.zeros((1, nblocks * blocksize))
+    x[0, 1000] = 1
+    blocks = [x[:, i:i + blocksize] for i in range(0, x.shape[1], blocksize)]
+    _, outs = run({}, blocks)
+    out = np.concatenate(outs, axis=1)[0]
+    assert np.argmax(out) == 1000
+    np.testing.assert_allclose(out[1000 - 50:1000], out[1000 + 50:1000:-1], rtol=0, atol=1e-15)
+
+@pytest.mark.parametrize('analytic', [False, True])
+def test_custom_leakage(rng, analytic):
+    blocks = stream()
+    beta = rng.standard_normal((3, 1))
+    _, outs = run({'analytic': analytic, 'leakage': {'method': 'custom', 'y': [0], 'x': [1, 2, 3],
+                                                     'beta': beta}}, blocks)
+    ref = offline(np.concatenate(blocks, axis=1), analytic)
+    ref[1:] -= beta @ ref[:1]
+    assert_close(np.concatenate(outs, axis=1), ref)
+
+def test_orthstat_leakage():
+    blocks = stream()
+    ref = offline(np.concatenate(blocks, axis=1), False)
+    reg = OrthStatRegressor().partial_fit(ref[1:], ref[:1])
+    _, outs = run({'leakage': {'method': 'orthstat', 'y': [0], 'x': [1, 2, 3], 'regressor': reg}}, blocks)
+    assert_close(np.concatenate(outs, axis=1)[1:], reg.transform(ref[1:], ref[:1]))
+
+def test_adaptive_orthstat_converges_to_batch_beta():
+    blocks = stream()
+    proc, _ = run({'leakage': {'method': 'orthstat', 'y': [0], 'x': [1, 2, 3]}}, blocks)
+    ref = offline(np.concatenate(blocks, axis=1), False)
+    np.testing.assert_allclose(proc._regressor.beta, orthstat_beta(ref[1:] @ ref[:1].T, ref[:1] @ ref[:1].T),
+                               rtol=1e-10)
+
+@pytest.mark.parametrize('smooth', [True, False])
+@pytest.mark.parametrize('analytic', [False, True])
+def test_downsampling(smooth, analytic):
+    blocks = stream()
+    _, outs = run({'analytic': analytic, 'downsfreq': 32., 'smooth': smooth}, blocks)
+    ref, _ = msfun_filt_downsample(offline(np.concatenate(blocks, axis=1), analytic),
+                                   {'sfreq': sfreq, 'downsfreq': 32., 'smooth': smooth})
+    assert_close(np.concatenate(outs, axis=1), ref)
+
+def test_reset_replays_stream():
+    blocks = stream()
+    proc, first = run({}, blocks)
+    proc.reset()
+    second = [proc.push(b) for b in blocks] + [proc.flush()]
+    np.testing.assert_array_equal(np.concatenate(first, axis=1), np.concatenate(second, axis=1))
@@ -0,0 +1,93 @@
+import tracemalloc
+import numpy as np
+import pytest
+from msfun import (Pipeline, msfun_sig_filter, msfun_filt_getanalytic, msfun_filt_removeleakage,
+                   msfun_filt_downsample, msfun_filt_preprocfiff)
+from conftest import FakeRaw
+
+sfreq = 256.
+
+def chained(sig, stages):
+    # Reference: the same stages as separate msfun_* calls
+    fs = sfreq
+    for stage in stages:
+        if stage['name'] == 'filter':
+            sig = msfun_sig_filter(sig, {'sfreq': fs, 'filt': stage['filt']})
+        elif stage['name'] == 'analytic':
+            sig = msfun_filt_getanalytic(sig)
+        elif stage['name'] == 'removeleakage':
+            sig = sig.copy()
+            cfg = {k: v for k, v in stage.items() if k not in ['name', 'x', 'y']}
+            for epoch in sig:
+                epoch[stage['x']] = msfun_filt_removeleakage(epoch[stage['x']], epoch[stage['y']], cfg)
+        elif stage['name'] == 'downsample':
+            sig, _ = msfun_filt_downsample(sig, {'sfreq': fs, 'downsfreq': stage['downsfreq']})
+            fs = fs / round(fs / stage['downsfreq'])
+    return sig
+
+def assert_close(a, b):
+    np.testing.assert_allclose(a, b, rtol=0, atol=1e-12 * np.max(np.abs(b)))
+
+leakage = {'name': 'removeleakage', 'method': 'orthstat', 'y': [0], 'x': [1, 2, 3]}
+cases = {
+    'filter': [{'name': 'filter', 'filt': 'alpha'}],
+    'filter+analytic': [{'name': 'filter', 'filt': 'alpha'}, {'name': 'analytic'}],
+    'analytic+orthinst': [{'name': 'filter', 'filt': 'beta'}, {'name': 'analytic'},
+                          dict(leakage, method='orthinst')],
+    'full': [{'name': 'filter', 'filt': 'alpha'}, {'name': 'analytic'}, leakage,
+             {'name': 'downsample', 'downsfreq': 32.}],
+    'real+leakage+downsample': [{'name': 'filter', 'filt': 'alpha'}, leakage,
+                                {'name': 'downsample', 'downsfreq': 64.}],
+}
+
+@pytest.mark.parametrize('case', list(cases))
+def test_pipeline_matches_chained_calls(rng, case):
+    sig = rng.standard_normal((3, 4, 512))
+    before = sig.copy()
+    pipe = Pipeline({'sfreq': sfreq, 'stages': cases[case]})
+    out = pipe.run(sig)
+    np.testing.assert_array_equal(sig, before)
+    assert_close(out, chained(sig, cases[case]))
+
+def test_buffers_reused_across_runs(rng):
+    pipe = Pipeline({'sfreq': sfreq, 'stages': cases['filter+analytic']})
+    a = rng.standard_normal((2, 4, 512))
+    b = rng.standard_normal((2, 4, 512))
+    out_a = pipe.run(a)
+    buffers = dict(pipe._buffers)
+    out_b = pipe.run(b)
+    assert all(pipe._buffers[k] is v for k, v in buffers.items())
+    # Results never alias the work buffers, so a later run leaves earlier outputs intact
+    assert_close(out_a, chained(a, cases['filter+analytic']))
+    assert_close(out_b, chained(b, cases['filter+analytic']))
+
+def test_preprocfiff_stage(rng):
+    data = rng.standard_normal((4, 5000))
+    raw = FakeRaw(data, sfreq)
+    times = (np.arange(3)[:, None] * 1000 + np.arange(512)) / sfreq
+    pcfg = {'chans': raw.info['ch_names']}
+    pipe = Pipeline({'stages': [{'name': 'preprocfiff', 'cfg': pcfg}] + cases['full']})
+    sig, _ = msfun_filt_preprocfiff(raw, times, dict(pcfg))
+    assert_close(pipe.run(raw, times), chained(sig, cases['full']))
+
+def test_invalid_stages():
+    with pytest.raises(ValueError):
+        Pipeline({'sfreq': sfreq, 'stages': [{'name': 'analytic'}, {'name': 'filter', 'filt': 'alpha'}]})
+    with pytest.raises(ValueError):
+        Pipeline({'sfreq': sfreq, 'stages': [dict(leakage, method='orthinst')]})
+    with pytest.raises(ValueError):
+        Pipeline({'sfreq': sfreq, 'stages': [{'name': 'filter', 'filt': 'alpha'},
+                                             {'name': 'preprocfiff', 'cfg': {}}]})
+
+def test_profile_report(rng, monkeypatch):
+    sig = rng.standard_normal((3, 4, 512))
+    stages = ['filter+analytic', 'removeleakage', 'downsample']
+    pipe = Pipeline({'sfreq': sfreq, 'stages': cases['full'], 'profile': True})
+    assert_close(pipe.run(sig), chained(sig, cases['full']))
+    assert [r['stage'] for r in pipe.report] == stages
+    assert all(r['time'] >= 0 and r['peak_bytes'] >= 0 for r in pipe.report)
+
+    # Python 3.8 has no tracemalloc.reset_peak
+    monkeypatch.delattr(tracemalloc, 'reset_peak', raising=False)
+    pipe.run(sig)
+    assert [r['stage'] for r in pipe.report] == stages
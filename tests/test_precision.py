@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from msfun import (filt_map, msfun_filt_precision, msfun_sig_filter, msfun_sig_filterbank, msfun_filt_getanalytic,
+                   msfun_filt_bandanalytic, msfun_filt_orthogonalize, msfun_filt_removeleakage,
+                   msfun_filt_downsample, msfun_filt_computespectrum, msfun_filt_welchspectrum,
+                   msfun_filt_preprocfiff, Pipeline, OrthStatRegressor, GCSOperator)
+from conftest import FakeRaw
+
+sfreq = 256.
+rng = np.random.default_rng(1)
+x = rng.standard_normal((4, 8, 5000)) + 3 * np.sin(2 * np.pi * 10 * np.arange(5000) / sfreq) + 50.  # DC offset
+Z = msfun_filt_bandanalytic(x[0], {'sfreq': sfreq, 'filt': 'alpha'})
+beta = rng.standard_normal((6, 2))
+inv = {'nsource': 6, 'invop': rng.standard_normal((6, 20)), 'leadfield': rng.standard_normal((20, 6))}
+raw = FakeRaw(rng.standard_normal((8, 100000)) * 1e-5 + 1e-4, sfreq)
+times = (np.sort(rng.integers(0, 99000, 20))[:, None] + np.arange(500)) / sfreq
+filt = dict(filt_map['alpha'], win='hann')
+
+def flt(**k):
+    return dict({'sfreq': sfreq, 'filt': dict(filt)}, **k)
+
+def bank(**k):
+    return dict({'sfreq': sfreq, 'filt': ['alpha', 'beta', 'none']}, **k)
+
+def preproc(**k):
+    return dict({'chans': raw.info['ch_names'], 'filter': True, 'blc': True, 'filt': dict(filt)}, **k)
+
+def leak(method, **k):
+    return lambda p: msfun_filt_removeleakage(Z[:6], Z[6:], dict(method=method, **k, **p))
+
+stages = [{'name': 'filter', 'filt': 'alpha'}, {'name': 'analytic'},
+          {'name': 'removeleakage', 'method': 'orthstat', 'y': [0]}, {'name': 'downsample', 'downsfreq': 32.}]
+
+# name: (run(p) with p = {} or {'dtype': 'float32'} merged into cfg, float32 output dtype, rel. RMS bound,
+#        whether the function takes a cfg)
+cases = {
+    'sig_filter': (lambda p: msfun_sig_filter(x, flt(**p)), np.float32, 1e-6, True),
+    'sig_filter decimate': (lambda p: msfun_sig_filter(x, flt(downsfreq=32., **p)), np.float32, 1e-6, True),
+    'sig_filter complex': (lambda p: msfun_sig_filter(x + 1j * x, flt(**p)), np.float32, 1e-6, True),
+    'filterbank': (lambda p: msfun_sig_filterbank(x, bank(**p)), np.float32, 1e-6, True),
+    'getanalytic': (lambda p: msfun_filt_getanalytic(x), np.complex64, 1e-6, False),
+    'bandanalytic': (lambda p: msfun_filt_bandanalytic(x, flt(**p)), np.complex64, 1e-6, True),
+    'bandanalytic list': (lambda p: msfun_filt_bandanalytic(x, bank(**p)), np.complex64, 1e-6, True),
+    'orthogonalize': (lambda p: msfun_filt_orthogonalize(Z[:6], Z[6:7]), np.complex64, 1e-6, False),
+    'removeleakage orthstat': (leak('orthstat'), np.complex64, 5e-5, True),
+    'removeleakage orthinst': (leak('orthinst'), np.complex64, 1e-6, True),
+    'removeleakage custom': (leak('custom', beta=beta), np.complex64, 1e-6, True),
+    'removeleakage gcs': (lambda p: msfun_filt_removeleakage(Z[:6], Z[6:7], dict({'method': 'gcs', 'gcs': {
+        'ind': 3, 'inv': inv}}, **p)), np.complex64, 1e-6, True),
+    'OrthStatRegressor': (lambda p: OrthStatRegressor().partial_fit(Z[:6], Z[6:]).transform(Z[:6], Z[6:]),
+                          np.complex64, 5e-5, False),
+    'GCSOperator': (lambda p: GCSOperator(inv).apply(Z[:6], Z[6:8], seeds=[1, 2]), np.complex64, 1e-6, False),
+    'downsample smooth': (lambda p: msfun_filt_downsample(x, dict({'sfreq': sfreq, 'downsfreq': 32.}, **p))[0],
+                          np.float32, 1e-6, True),
+    'downsample pick': (lambda p: msfun_filt_downsample(x, dict({'sfreq': sfreq, 'downsfreq': 32.,
+                                                                 'smooth': False}, **p))[0], np.float32, 1e-6, True),
+    'computespectrum power': (lambda p: msfun_filt_computespectrum(x, dict({'sfreq': sfreq}, **p))[0],
+                              np.float32, 1e-6, True),
+    'computespectrum fourier': (lambda p: msfun_filt_computespectrum(x, dict({'sfreq': sfreq, 'type': 'fourier'},
+                                                                             **p))[0], np.complex64, 1e-6, True),
+    'welch hann': (lambda p: msfun_filt_welchspectrum(x, dict({'sfreq': sfreq}, **p))[0], np.float32, 1e-6, True),
+    'welch dpss': (lambda p: msfun_filt_welchspectrum(x, dict({'sfreq': sfreq, 'taper': 'dpss'}, **p))[0],
+                   np.float32, 1e-6, True),
+    'welch stream': (lambda p: msfun_filt_welchspectrum(iter(np.split(x[0], 10, axis=1)),
+                                                        dict({'sfreq': sfreq}, **p))[0], np.float32, 1e-6, True),
+    'preprocfiff epochs': (lambda p: msfun_filt_preprocfiff(raw, times, preproc(**p))[0], np.float32, 1e-6, True),
+    'preprocfiff continuous': (lambda p: msfun_filt_preprocfiff(raw, times.ravel()[:4000], preproc(**p))[0],
+                               np.float32, 1e-6, True),
+    'pipeline': (lambda p: Pipeline(dict({'sfreq': sfreq, 'stages': stages}, **p)).run(x[0]),
+                 np.complex64, 5e-5, True),
+    'pipeline real': (lambda p: Pipeline(dict({'sfreq': sfreq, 'stages': [stages[0], stages[3]]}, **p)).run(x),
+                      np.float32, 1e-6, True),
+}
+
+def rel_rms(a, b):
+    return np.sqrt(np.mean(np.abs(a - b) ** 2) / np.mean(np.abs(b) ** 2))
+
+@pytest.mark.parametrize('mode', ['context', 'cfg'])
+@pytest.mark.parametrize('name', list(cases))
+def test_float32_matches_float64(name, mode):
+    run, dtype, bound, takes_cfg = cases[name]
+    if mode == 'cfg' and not takes_cfg:
+        pytest.skip("no cfg: precision set by msfun_filt_precision only")
+    ref = run({})
+    assert ref.dtype == np.result_type(dtype, np.float64)
+    if mode == 'context':
+        with msfun_filt_precision('float32'):
+            out = run({})
+    else:
+        out = run({'dtype': 'float32'})
+    assert out.dtype == dtype
+    assert out.shape == ref.shape
+    assert rel_rms(out, ref) < bound
+
+def test_cfg_overrides_context():
+    with msfun_filt_precision('float32'):
+        assert msfun_sig_filter(x, flt(dtype='float64')).dtype == np.float64
+    with msfun_filt_precision('float64'):
+        assert msfun_sig_filter(x.astype(np.float32), flt()).dtype == np.float64
+
+def test_spectral_summaries_unchanged():
+    _, _, b32 = msfun_filt_computespectrum(x, {'sfreq': sfreq, 'dtype': 'float32', 'return_band_par': True})
+    _, _, b64 = msfun_filt_computespectrum(x, {'sfreq': sfreq, 'return_band_par': True})
+    for key in ['fcenter', 'fmin', 'fmax']:
+        np.testing.assert_array_equal(b32[key], b64[key])
+
+def test_invalid_dtype():
+    with pytest.raises(ValueError):
+        msfun_sig_filter(x, flt(dtype='float16'))
+    with pytest.raises(ValueError):
+        with msfun_filt_precision('int32'):
+            pass
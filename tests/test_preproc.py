@@ -0,0 +1,71 @@
+import tracemalloc
+import numpy as np
+import pytest
+from msfun import filt_map, gather_samples, baseline_correct, msfun_filt_preprocfiff, msfun_filt_preprocmff
+from conftest import FakeRaw
+
+sfreq = 256.
+
+def read_both(data, mff_recording, times, **cfg):
+    raw = FakeRaw(data, sfreq)
+    mff, cache_dir, names = mff_recording(data, sfreq)
+    sig_fiff, _ = msfun_filt_preprocfiff(raw, times, dict(cfg, chans=list(names)))
+    sig_mff, _ = msfun_filt_preprocmff(times, sfreq, dict(cfg, chans=list(names), mff_file=mff, cache_dir=cache_dir))
+    return sig_fiff, sig_mff
+
+@pytest.mark.parametrize('shape', [(300,), (1, 300), (4, 300)])
+@pytest.mark.parametrize('blc', [False, True])
+def test_readers_agree_on_shape(rng, mff_recording, shape, blc):
+    data = rng.standard_normal((3, 5000))
+    samples = np.arange(int(np.prod(shape))).reshape(shape) * 2  # starts at 0: same samples in both readers
+    sig_fiff, sig_mff = read_both(data, mff_recording, samples / sfreq, blc=blc, filter=True,
+                                  filt=dict(filt_map['alpha']))
+    expected = (3,) + shape if len(shape) == 1 else (shape[0], 3, shape[1])
+    assert sig_fiff.shape == sig_mff.shape == expected
+    np.testing.assert_allclose(sig_mff, sig_fiff, rtol=0, atol=1e-12)
+
+@pytest.mark.parametrize('samples', [np.array([0, 3000, 6005]), np.arange(20)[None] + [[0], [5990]]])
+def test_readers_reject_times_past_the_end(rng, mff_recording, samples):
+    data = rng.standard_normal((3, 6000))
+    with pytest.raises(ValueError, match='outside the recording'):
+        msfun_filt_preprocfiff(FakeRaw(data, sfreq), samples / sfreq, {'chans': ['E1', 'E2', 'E3']})
+    mff, cache_dir, names = mff_recording(data, sfreq)
+    with pytest.raises(ValueError, match='outside the recording'):
+        msfun_filt_preprocmff(samples / sfreq, sfreq, {'mff_file': mff, 'cache_dir': cache_dir, 'chans': names})
+
+@pytest.mark.parametrize('T', [np.array([3, 1, 7, 9]),                    # single span, take
+                               np.array([0, 1, 50, 99]),                  # several spans
+                               np.arange(10)[None] + np.array([[0], [90]])])  # epochs
+def test_gather_rejects_truncated_reads(rng, T):
+    data = rng.standard_normal((2, 95))
+    read = lambda start, stop: data[:, start:stop]  # slicing past the end truncates silently
+    with pytest.raises(ValueError, match='outside the recording'):
+        gather_samples(read, T + 90 * (T.ndim == 1), 2, maxgap=10)
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_baseline_correct_runs(rng, dtype):
+    T = np.concatenate((np.arange(0, 50), np.arange(80, 81), np.arange(100, 300), np.arange(400, 449)))
+    sig = rng.standard_normal((3, T.size)).astype(dtype) + 10
+    ref = sig.astype(np.float64)
+    for run in np.split(np.arange(T.size), np.flatnonzero(np.diff(T) > 1) + 1):
+        ref[:, run] -= ref[:, run].mean(axis=1, keepdims=True)
+    out = baseline_correct(sig, T)
+    assert out is sig and sig.dtype == dtype
+    np.testing.assert_allclose(sig, ref, rtol=0, atol=1e-12 if dtype == np.float64 else 1e-5)
+
+def test_baseline_correct_epochs(rng):
+    sig = rng.standard_normal((4, 3, 100)) + 5
+    ref = sig - sig.mean(axis=-1, keepdims=True)
+    baseline_correct(sig, None)
+    np.testing.assert_allclose(sig, ref, rtol=0, atol=1e-12)
+
+def test_baseline_correct_in_place(rng):
+    T = np.arange(400000).reshape(4, -1)[:, :50000].ravel()  # 4 runs
+    sig = rng.standard_normal((8, T.size))
+    tracemalloc.start()
+    try:
+        baseline_correct(sig, T)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < sig.nbytes / 4
@@ -0,0 +1,75 @@
+import os
+import numpy as np
+import pytest
+from msfun import msfun_filt_removeleakage, OrthStatRegressor, GCSOperator
+
+def assert_close(a, b):
+    np.testing.assert_allclose(a, b, rtol=0, atol=1e-12 * np.max(np.abs(b)))
+
+@pytest.mark.parametrize('complex_sig', [False, True])
+def test_orthstat_regressor_matches_batch(rng, complex_sig):
+    X = rng.standard_normal((5, 3000))
+    Y = rng.standard_normal((2, 3000)) + 0.3 * X[:2]
+    if complex_sig:
+        X = X + 1j * rng.standard_normal(X.shape)
+        Y = Y + 1j * rng.standard_normal(Y.shape)
+    ref = msfun_filt_removeleakage(X, Y, {'method': 'orthstat'})
+
+    reg = OrthStatRegressor()
+    bounds = [0, 700, 701, 1800, 3000]  # uneven chunks
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        reg.partial_fit(X[:, a:b], Y[:, a:b])
+    assert reg.n_samples == 3000
+    Z = np.concatenate([reg.transform(X[:, a:b], Y[:, a:b]) for a, b in zip(bounds[:-1], bounds[1:])], axis=1)
+    assert_close(Z, ref)
+
+def test_orthstat_regressor_epochs(rng):
+    X = rng.standard_normal((4, 3, 500))
+    Y = rng.standard_normal((4, 1, 500)) + 0.5 * X[:, :1]
+    reg = OrthStatRegressor().partial_fit(X[:2], Y[:2]).partial_fit(X[2:], Y[2:])
+    Xc = X.transpose(1, 0, 2).reshape(3, -1)
+    Yc = Y.transpose(1, 0, 2).reshape(1, -1)
+    ref = msfun_filt_removeleakage(Xc, Yc, {'method': 'orthstat'})
+    assert_close(reg.transform(X, Y).transpose(1, 0, 2).reshape(3, -1), ref)
+
+def test_orthstat_regressor_errors(rng):
+    reg = OrthStatRegressor()
+    with pytest.raises(ValueError):
+        reg.beta
+    reg.partial_fit(rng.standard_normal((3, 10)), rng.standard_normal((1, 10)))
+    with pytest.raises(ValueError):
+        reg.partial_fit(rng.standard_normal((2, 10)), rng.standard_normal((1, 10)))
+
+def make_inv(rng, nsource=30, nsensor=12):
+    return {'nsource': nsource, 'invop': rng.standard_normal((nsource, nsensor)),
+            'leadfield': rng.standard_normal((nsensor, nsource))}
+
+def test_gcs_operator_matches_per_seed(rng):
+    inv = make_inv(rng)
+    X = rng.standard_normal((30, 200))
+    Y = rng.standard_normal((30, 200))
+    op = GCSOperator(inv)
+    for ind in [1, 7, 30]:
+        ref = msfun_filt_removeleakage(X, Y[ind - 1:ind], {'method': 'gcs', 'gcs': {'ind': ind, 'inv': inv}})
+        via_op = msfun_filt_removeleakage(X, Y[ind - 1:ind], {'method': 'gcs', 'gcs': {'ind': ind, 'operator': op}})
+        assert_close(via_op, ref)
+        assert_close(op.apply(X, Y[ind - 1:ind], seeds=[ind])[0], ref)
+
+    Z = op.apply(X, Y)
+    assert Z.shape == (30, 30, 200)
+    assert_close(Z[4], msfun_filt_removeleakage(X, Y[4:5], {'method': 'gcs', 'gcs': {'ind': 5, 'inv': inv}}))
+
+def test_gcs_operator_seed_subset_and_cache(rng, tmp_path):
+    inv = make_inv(rng)
+    seeds = [3, 11, 20]
+    op = GCSOperator(inv, seeds=seeds, cache_dir=str(tmp_path))
+    assert op.beta.shape == (30, 3)
+    assert len(os.listdir(tmp_path)) == 1
+    cached = GCSOperator(inv, seeds=seeds, cache_dir=str(tmp_path))
+    assert isinstance(cached.beta, np.memmap)
+    np.testing.assert_array_equal(cached.beta, op.beta)
+    np.testing.assert_allclose(op.beta[np.array(seeds) - 1, np.arange(3)], 1)
+    with pytest.raises(ValueError):
+        op.beta_for(4)
+    with pytest.raises(ValueError):
+        GCSOperator(inv, seeds=[0])
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from scipy.fft import fft, ifft
+from msfun import (filt_map, msfun_filt_preparecosine, msfun_sig_filter, msfun_sig_filterbank,
+                   msfun_filt_computespectrum, msfun_filt_preprocfiff, msfun_filt_preprocmff)
+from conftest import FakeRaw
+
+sfreq = 256.  # samples / sfreq round-trips exactly through the readers' int(times * sfreq)
+filt = dict(filt_map['alpha'], win='hann')
+
+def reference_filter(sig, filt, sfreq):
+    # Full two-sided fft/ifft path the rfft/irfft implementation must reproduce
+    win, F = msfun_filt_preparecosine(filt, sig.shape[-1], sfreq)
+    return np.real(ifft(fft(sig * win, axis=-1) * F, axis=-1))
+
+def make_signal(rng, shape, complex_sig):
+    sig = rng.standard_normal(shape)
+    if complex_sig:
+        sig = sig + 1j * rng.standard_normal(shape)
+    return sig
+
+def assert_close(a, b):
+    np.testing.assert_allclose(a, b, rtol=0, atol=1e-12 * np.max(np.abs(b)))
+
+@pytest.mark.parametrize('T', [500, 501])
+@pytest.mark.parametrize('complex_sig', [False, True])
+@pytest.mark.parametrize('epochs', [False, True])
+def test_sig_filter_matches_fft(rng, T, complex_sig, epochs):
+    sig = make_signal(rng, (3, 4, T) if epochs else (4, T), complex_sig)
+    out = msfun_sig_filter(sig, {'sfreq': sfreq, 'filt': dict(filt)})
+    assert out.shape == sig.shape and np.isrealobj(out)
+    assert_close(out, reference_filter(sig, filt, sfreq))
+
+@pytest.mark.parametrize('T', [500, 501])
+@pytest.mark.parametrize('complex_sig', [False, True])
+def test_sig_filterbank_matches_fft(rng, T, complex_sig):
+    sig = make_signal(rng, (2, 4, T), complex_sig)
+    bands = ['alpha', filt, 'beta']
+    out = msfun_sig_filterbank(sig, {'sfreq': sfreq, 'filt': list(bands)})
+    assert out.shape == (3,) + sig.shape
+    for b, band in enumerate(bands):
+        band = filt_map[band] if isinstance(band, str) else band
+        assert_close(out[b], reference_filter(sig, band, sfreq))
+
+@pytest.mark.parametrize('T', [500, 501])
+def test_preprocfiff_filter_matches_fft(rng, T):
+    data = rng.standard_normal((4, 20000))
+    raw = FakeRaw(data, sfreq)
+    samples = np.sort(rng.integers(0, 19000, 5))[:, None] + np.arange(T)
+    cfg = {'chans': raw.info['ch_names'], 'filter': True, 'filt': dict(filt)}
+    sig, _ = msfun_filt_preprocfiff(raw, samples / sfreq, cfg)
+    assert sig.shape == (5, 4, T)
+    assert_close(sig, reference_filter(data[:, samples].transpose(1, 0, 2), filt, sfreq))
+
+    cont = np.arange(1000, 1000 + T)
+    sig, _ = msfun_filt_preprocfiff(raw, cont / sfreq, dict(cfg))
+    assert_close(sig, reference_filter(data[:, cont], filt, sfreq))
+
+@pytest.mark.parametrize('T', [500, 501])
+def test_preprocmff_filter_matches_fft(rng, mff_recording, T):
+    data = rng.standard_normal((4, 20000))
+    mff, cache_dir, names = mff_recording(data, sfreq)
+    samples = np.sort(rng.integers(0, 19000, 5))[:, None] + np.arange(T)
+    samples -= samples.min()
+    cfg = {'mff_file': mff, 'cache_dir': cache_dir, 'chans': names, 'filter': True, 'filt': dict(filt)}
+    sig, _ = msfun_filt_preprocmff(samples / sfreq, sfreq, cfg)
+    assert sig.shape == (5, 4, T)
+    assert_close(sig, reference_filter(data[:, samples].transpose(1, 0, 2), filt, sfreq))
+
+@pytest.mark.parametrize('T', [500, 501])
+@pytest.mark.parametrize('complex_sig', [False, True])
+@pytest.mark.parametrize('cfg_type', ['power', 'fourier'])
+def test_computespectrum_matches_fft(rng, T, complex_sig, cfg_type):
+    sig = make_signal(rng, (2, 4, T), complex_sig)
+    spec, freq = msfun_filt_computespectrum(sig, {'sfreq': sfreq, 'type': cfg_type})
+    ref = fft(sig, axis=-1)[..., :T // 2]
+    if cfg_type == 'power':
+        ref = np.abs(ref) ** 2
+    assert spec.shape == ref.shape
+    assert_close(spec, ref)
+    np.testing.assert_allclose(freq, (np.arange(T) * sfreq / T)[:T // 2])
+
+@pytest.mark.parametrize('precision', [None, 'float32'])
+def test_sig_filterbank_complex_none_band(rng, precision):
+    sig = make_signal(rng, (2, 4, 500), True)
+    out = msfun_sig_filterbank(sig, {'sfreq': sfreq, 'filt': ['alpha', 'none'], 'dtype': precision})
+    assert out.dtype == (np.complex64 if precision else np.complex128)
+    eps = 1e-6 if precision else 1e-12
+    np.testing.assert_allclose(out[1], sig, rtol=eps)
+    ref = reference_filter(sig, filt_map['alpha'], sfreq)
+    np.testing.assert_allclose(out[0].real, ref, rtol=0, atol=eps * np.max(np.abs(ref)))
+    assert not np.any(out[0].imag)
+    real_only = msfun_sig_filterbank(sig, {'sfreq': sfreq, 'filt': ['alpha', 'beta']})
+    assert real_only.dtype == np.float64
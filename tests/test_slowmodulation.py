@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from scipy.signal import hilbert, resample
+from msfun import msfun_filt_slowmodulation, msfun_filt_bandanalytic
+
+sfreq = 256.
+
+def loop_slowmodulation(Z, fcenter):
+    # Reference: the original implementation, dividing the analytic signal by the carrier
+    T = Z.shape[-1]
+    analytic = np.iscomplexobj(Z)
+    if not analytic:
+        Z = hilbert(Z, axis=-1)
+    Zslow = Z / np.exp(2j * np.pi * (fcenter - 1) * np.arange(T) / T)
+    return Zslow if analytic else np.real(Zslow)
+
+def assert_close(a, b):
+    # The reference carrier exp(2j pi (f - 1) t / T) is itself only accurate to ~1e-12 for large f t
+    np.testing.assert_allclose(a, b, rtol=0, atol=1e-11 * np.max(np.abs(b)))
+
+@pytest.mark.parametrize('T', [1024, 1023])
+@pytest.mark.parametrize('shape', [(4,), (3, 4)])
+@pytest.mark.parametrize('analytic', [False, True])
+def test_matches_carrier_division(rng, T, shape, analytic):
+    Z = rng.standard_normal(shape + (T,))
+    if analytic:
+        Z = hilbert(Z, axis=-1)
+    for f in [1, 41, T // 2, T]:
+        out = msfun_filt_slowmodulation(Z, f)
+        assert out.shape == Z.shape and np.iscomplexobj(out) == analytic
+        assert_close(out, loop_slowmodulation(Z, f))
+
+def test_vector_fcenter(rng):
+    Z = rng.standard_normal((3, 4, 1000))
+    fc = np.array([5, 41, 80])
+    out = msfun_filt_slowmodulation(Z, fc)
+    assert out.shape == (3,) + Z.shape
+    for i, f in enumerate(fc):
+        assert_close(out[i], loop_slowmodulation(Z, int(f)))
+
+@pytest.mark.parametrize('T, M', [(1024, 128), (1016, 127)])
+def test_downsampled(rng, T, M):
+    # Narrow-band alpha signal: after demodulation at 10 Hz it is well inside the output band
+    Z = msfun_filt_bandanalytic(rng.standard_normal((4, T)), {'sfreq': sfreq, 'filt': 'alpha'})
+    f = int(round(10 * T / sfreq)) + 1
+    cfg = {'sfreq': sfreq, 'downsfreq': 32.}
+    out = msfun_filt_slowmodulation(Z, np.array([f]), cfg)
+    assert out.shape == (1, 4, M)
+    np.testing.assert_array_equal(cfg['tsamp'], np.round(np.arange(M) * T / M).astype(int))
+    assert cfg['downsfreq'] == sfreq * M / T
+    assert_close(out[0], resample(loop_slowmodulation(Z, f), M, axis=-1))
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from msfun import msfun_filt_spectralfeatures, msfun_filt_computespectrum
+from msfun.filt_spectralfeatures import default_quantiles
+
+def argmin_quantiles(P):
+    # Reference rule of the original band_par: first bin of minimal |P_cum - q|
+    P_cum = np.cumsum(P / np.sum(P, axis=-1, keepdims=True), axis=-1)
+    return {'f' + n: np.argmin(np.abs(P_cum - q), axis=-1) for n, q in default_quantiles.items()}
+
+def features(P):
+    return msfun_filt_spectralfeatures(P, np.arange(P.shape[-1]), {'quantiles': default_quantiles, 'bands': {}})
+
+def test_flat_cumulative_spectrum_takes_first_bin():
+    P = np.array([[0, 0, 0, 1, 1, 0, 0, 0], [1, 0, 0, 0, 0, 0, 0, 1.]])
+    feat = features(P)
+    for key, ref in argmin_quantiles(P).items():
+        np.testing.assert_array_equal(feat[key], ref)
+    assert feat['fmin'][0] == 0
+
+@pytest.mark.parametrize('zero_fraction', [0, 0.5, 0.9])
+@pytest.mark.parametrize('floor', [0, 1e-30])
+def test_quantiles_match_argmin(rng, zero_fraction, floor):
+    P = rng.random((200, 64)) ** 4
+    P[rng.random(P.shape) < zero_fraction] = floor
+    P[:, 0] += 1e-3  # no all-zero rows
+    feat = msfun_filt_spectralfeatures(P.reshape(10, 20, 64), np.arange(64), {'block_bytes': 8 * 64 * 7})
+    for key, ref in argmin_quantiles(P).items():
+        np.testing.assert_array_equal(feat[key].ravel(), ref)
+
+def test_pure_tone_band_par():
+    sfreq, T = 250., 1000
+    t = np.arange(T) / sfreq
+    sig = np.sin(2 * np.pi * 10 * t)[np.newaxis]
+    spec, freq, band_par = msfun_filt_computespectrum(sig, {'sfreq': sfreq, 'return_band_par': True})
+    for key, ref in argmin_quantiles(spec).items():
+        np.testing.assert_array_equal(band_par[key], ref)
+    assert band_par['fcenter'][0] == band_par['fmin'][0] == 0
+
+def test_empty_rows_give_zero():
+    feat = features(np.zeros((2, 16)))
+    assert np.all(feat['fcenter'] == 0) and np.all(feat['fmin'] == 0)
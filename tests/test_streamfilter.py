@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from scipy.signal import fftconvolve
+from msfun import filt_map, msfun_filt_streamfilter, fir_ntaps, cosine_fir
+
+sfreq = 256.
+
+def offline(x, ntaps):
+    h = cosine_fir(filt_map['alpha'], ntaps, sfreq)
+    return fftconvolve(x, h[np.newaxis, :], axes=-1)[:, ntaps // 2:ntaps // 2 + x.shape[1]]
+
+def assert_close(a, b):
+    np.testing.assert_allclose(a, b, rtol=0, atol=1e-12 * np.max(np.abs(b)))
+
+@pytest.mark.parametrize('blocksize', [100, 257, 4096])
+def test_array_matches_full_convolution(rng, blocksize):
+    x = rng.standard_normal((3, 5001))
+    cfg = {'sfreq': sfreq, 'filt': 'alpha', 'blocksize': blocksize}
+    out = np.concatenate(list(msfun_filt_streamfilter(x, cfg)), axis=1)
+    assert cfg['ntaps'] == fir_ntaps(filt_map['alpha'], sfreq)
+    assert out.shape == x.shape
+    assert_close(out, offline(x, cfg['ntaps']))
+
+def test_irregular_chunks(rng):
+    x = rng.standard_normal((2, 3000))
+    cuts = np.sort(rng.integers(0, x.shape[1], 12))
+    chunks = np.split(x, cuts, axis=1)
+    cfg = {'sfreq': sfreq, 'filt': 'alpha', 'ntaps': 101, 'blocksize': 256}
+    out = np.concatenate(list(msfun_filt_streamfilter(chunks, cfg)), axis=1)
+    sizes = [c.shape[1] for c in msfun_filt_streamfilter(chunks, dict(cfg))]
+    assert sizes[0] == 256 - 101 // 2 and set(sizes[1:-1]) == {256}  # start-up delay dropped once
+    assert_close(out, offline(x, 101))
+
+def test_memmap_input(rng, tmp_path):
+    x = rng.standard_normal((2, 4000))
+    mm = np.lib.format.open_memmap(str(tmp_path / 'x.npy'), mode='w+', shape=x.shape)
+    mm[:] = x
+    cfg = {'sfreq': sfreq, 'filt': 'alpha', 'blocksize': 512}
+    out = np.concatenate(list(msfun_filt_streamfilter(mm, cfg)), axis=1)
+    assert_close(out, offline(x, cfg['ntaps']))
+
+def test_empty_stream():
+    assert list(msfun_filt_streamfilter(iter([]), {'sfreq': sfreq, 'filt': 'alpha'})) == []
+
+def test_invalid_ntaps():
+    with pytest.raises(ValueError):
+        list(msfun_filt_streamfilter(np.zeros((1, 10)), {'sfreq': sfreq, 'filt': 'alpha', 'ntaps': 100}))
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from scipy.signal import welch
+from msfun import msfun_filt_welchspectrum, msfun_filt_computespectrum
+
+sfreq = 256.
+
+def assert_close(a, b):
+    np.testing.assert_allclose(a, b, rtol=0, atol=1e-12 * np.max(np.abs(b)))
+
+@pytest.mark.parametrize('complex_sig', [False, True])
+def test_boxcar_equals_computespectrum(rng, complex_sig):
+    sig = rng.standard_normal((5, 3, 400))
+    if complex_sig:
+        sig = sig + 1j * rng.standard_normal(sig.shape)
+    P, freq = msfun_filt_welchspectrum(sig, {'sfreq': sfreq, 'nfft': 400, 'overlap': 0, 'taper': 'boxcar'})
+    ref, ref_freq = msfun_filt_computespectrum(sig, {'sfreq': sfreq, 'type': 'power'})
+    assert_close(P, ref.mean(axis=0))
+    np.testing.assert_allclose(freq, ref_freq)
+
+@pytest.mark.parametrize('taper', ['hann', 'hamming'])
+@pytest.mark.parametrize('overlap', [0, 0.5])
+def test_matches_scipy_welch(rng, taper, overlap):
+    sig = rng.standard_normal((3, 5000))
+    nfft = 512
+    cfg = {'sfreq': sfreq, 'nfft': nfft, 'overlap': overlap, 'taper': taper}
+    P, freq = msfun_filt_welchspectrum(sig, cfg)
+    f, ref = welch(sig, fs=sfreq, window=taper, nperseg=nfft, noverlap=int(overlap * nfft), detrend=False,
+                   return_onesided=False, scaling='density', axis=-1)
+    # Tapers are scaled to nfft energy, scipy's density to 1 / (fs * sum(w ** 2))
+    assert_close(P, ref[:, :nfft // 2] * sfreq * nfft)
+    np.testing.assert_allclose(freq, f[:nfft // 2])
+    assert cfg['nseg'] == (5000 - nfft) // (nfft - int(round(overlap * nfft))) + 1
+
+@pytest.mark.parametrize('taper', ['hann', 'dpss'])
+def test_stream_equals_array(rng, taper):
+    sig = rng.standard_normal((2, 6000))
+    cfg = {'sfreq': sfreq, 'nfft': 256, 'taper': taper}
+    P, _ = msfun_filt_welchspectrum(sig, cfg)
+    cuts = np.sort(rng.integers(0, sig.shape[1], 15))
+    scfg = dict(cfg)
+    Ps, _ = msfun_filt_welchspectrum(np.split(sig, cuts, axis=1), scfg)
+    assert scfg['nseg'] == cfg['nseg']
+    assert_close(Ps, P)
+    assert_close(scfg['var'], cfg['var'])
+
+def test_variance_of_segment_powers(rng):
+    sig = rng.standard_normal((2, 2048))
+    cfg = {'sfreq': sfreq, 'nfft': 256, 'overlap': 0, 'taper': 'boxcar'}
+    P, _ = msfun_filt_welchspectrum(sig, cfg)
+    seg = np.abs(np.fft.fft(sig.reshape(2, 8, 256), axis=-1)[..., :128]) ** 2
+    assert_close(P, seg.mean(axis=1))
+    assert_close(cfg['var'], seg.var(axis=1, ddof=1))
+
+def test_per_epoch(rng):
+    sig = rng.standard_normal((4, 2, 1024))
+    P, _ = msfun_filt_welchspectrum(sig, {'sfreq': sfreq, 'nfft': 256, 'average': False})
+    assert P.shape == (4, 2, 128)
+    for k in range(4):
+        assert_close(P[k], msfun_filt_welchspectrum(sig[k], {'sfreq': sfreq, 'nfft': 256})[0])
+
+def test_invalid_cfg(rng):
+    sig = rng.standard_normal((2, 100))
+    with pytest.raises(ValueError):
+        msfun_filt_welchspectrum(sig, {'sfreq': sfreq, 'nfft': 200})
+    with pytest.raises(ValueError):
+        msfun_filt_welchspectrum(sig, {'sfreq': sfreq, 'nfft': 50, 'overlap': 1})